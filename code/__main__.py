@@ -8,7 +8,7 @@ python -m pinball
 
 Author: Kevin Wing
 Project: University of Idaho PLC Pinball
-Last Updated: 3/11/2025
+Last Updated: 10/19/2026
 """
 import sys
 import os
@@ -22,23 +22,74 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "."))
 
 # Import the necessary APIs
 from core.screen_api import ScreenAPI
-from core.modbus_api import ModbusAPI
+from core.modbus_api import ModbusAPI, load_event_fifo
+from core.modbus_worker import ProcessModbusAPI
+from core.sim_plc import SimulatedPLC
 from core.sound_api import SoundAPI
-from core.event_api import EventAPI
+from core.bundle import AssetBundle
+from core.event_api import EventAPI, COUNT, RISING
+from core.high_scores import HighScoreStore
+from core.telemetry import Telemetry
+from core.watchdog import Watchdog
 
 # import the GameStateController class
-from core.game_state import GameStateController
+from core.game_state import GameStateController, State
 
 plc_modbus_ip = "192.168.1.10"
 plc_modbus_port = 502
+# run Modbus polling and change detection in their own process; changes reach
+# EventAPI in order through a shared memory ring, so rendering cannot hide a pulse
+use_io_process = False
+# play against the in-memory PLC model instead of real hardware
+use_simulated_plc = False
+
+# keyboard stand-ins for the playfield switches when simulating
+SIM_KEYS = {
+    pygame.K_s: lambda plc: plc.press_start(),
+    pygame.K_r: lambda plc: plc.flipper_reset(),
+    pygame.K_1: lambda plc: plc.hit("slingshot"),
+    pygame.K_2: lambda plc: plc.hit("drop_target"),
+    pygame.K_3: lambda plc: plc.hit("lane_1"),
+    pygame.K_4: lambda plc: plc.hit("lane_2"),
+    pygame.K_5: lambda plc: plc.hit("lane_3"),
+    pygame.K_6: lambda plc: plc.hit("lane_4"),
+    pygame.K_p: lambda plc: plc.hit("pop_bumper"),
+    pygame.K_d: lambda plc: plc.hit("ball_drain"),
+}
 
 config_path = os.path.join(os.path.dirname(__file__), "config/devices.json")
 sound_path = os.path.join(os.path.dirname(__file__), "assets/sounds")
-
-modbus_api = ModbusAPI(plc_modbus_ip, plc_modbus_port, config_path)
+high_score_path = os.path.join(os.path.dirname(__file__), "data/high_scores.db")
+telemetry_path = os.path.join(os.path.dirname(__file__), "data/telemetry")
+diagnostics_path = os.path.join(os.path.dirname(__file__), "data/diagnostics")
+# built by `python core/bundle.py --decode`; loose files are used when it is missing
+bundle_path = os.path.join(os.path.dirname(__file__), "data/assets.bundle")
+
+sim_plc = None
+if use_simulated_plc:
+    # the model logs to the same event FIFO block the config points ModbusAPI at
+    event_fifo = load_event_fifo(config_path)
+    sim_plc = SimulatedPLC(fifo_address=event_fifo.address if event_fifo else None,
+                           fifo_capacity=event_fifo.capacity if event_fifo else 30)
+if use_io_process and sim_plc is None:
+    modbus_api = ProcessModbusAPI(plc_modbus_ip, plc_modbus_port, config_path)
+else:
+    modbus_api = ModbusAPI(plc_modbus_ip, plc_modbus_port, config_path, transport=sim_plc)
 event_api = EventAPI(modbus_api)
-screen_api = ScreenAPI()
-sound_api = SoundAPI(sound_dir=sound_path)
+
+# Heartbeat deadlines for stall detection; `kill -USR1 <pid>` toggles the profiler
+watchdog = Watchdog(dump_dir=diagnostics_path)
+if isinstance(modbus_api, ModbusAPI):
+    modbus_api.heartbeat = watchdog.register("modbus_poll", deadline=2.0)
+event_api.heartbeat = watchdog.register("event_monitor", deadline=1.0)
+watchdog.install_signal_handler()
+high_score_store = HighScoreStore(high_score_path)
+telemetry = Telemetry(telemetry_path,
+                      device_names=list(modbus_api.devices),
+                      state_names=[state.name.lower() for state in State])
+asset_bundle = AssetBundle(bundle_path) if os.path.exists(bundle_path) else None
+screen_api = ScreenAPI(high_score_store=high_score_store, asset_bundle=asset_bundle)
+sound_api = SoundAPI(sound_dir=sound_path, bundle=asset_bundle)
 
 # Load sounds
 # sound_api.load_sound("fight_song", "fight_song.mp3")
@@ -50,17 +101,30 @@ controller = GameStateController(
     sound_api=sound_api,
     event_api=event_api,
     modbus_api=modbus_api,
+    high_score_store=high_score_store,
+    telemetry=telemetry,
 )
 
-# Register events for all devices
+# Register events for all devices. Counters emit "_pressed" once per poll
+# with the batched hit count; coils also emit "_released" on falling edges.
+# The start_button coil mirrors the PLC's game-on bit, so its falling edge
+# means the PLC left play (game over or flipper reset).
 for name in modbus_api.devices.keys():
-    event_api.register(f"{name}_pressed", lambda n=name: controller.handle_event(f"{n}_pressed"))
+    for suffix in ("pressed", "released"):
+        event_name = f"{name}_{suffix}"
+        event_api.register(event_name, lambda e=event_name: controller.handle_event(e))
 
-# Register specific events
-event_api.register("game_over_timeout", lambda: controller.handle_event("game_over_timeout"))
+# Feed hits to telemetry from the event thread
+for name, device in modbus_api.devices.items():
+    if device.is_counter:
+        event_api.subscribe(name, COUNT, telemetry.record_hit)
+    elif device.direction == "input":
+        event_api.subscribe(name, RISING, telemetry.record_hit)
 
 clock = pygame.time.Clock()
 running = True
+# registered last: asset loading above may take longer than the frame deadline
+main_heartbeat = watchdog.register("main_loop", deadline=0.5)
 
 try:
     while running:
@@ -71,19 +135,29 @@ try:
                 running = False
             elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
                 running = False
+            elif event.type == pygame.KEYDOWN and sim_plc is not None and event.key in SIM_KEYS:
+                SIM_KEYS[event.key](sim_plc)
         # time.sleep(0.5)
 
+        main_heartbeat.beat()
         delta_time = clock.get_time()
         controller.update(delta_time)
         screen_api.update(
             state=controller.get_state(),
             score=controller.get_score(),
-            ball=controller.get_ball()
+            ball=controller.get_ball(),
+            plc_online=modbus_api.is_online()
         )
         
         clock.tick(30)
 finally:
     # stop the API threads
+    watchdog.stop()
     event_api.stop()
     modbus_api.stop()
+    high_score_store.stop()
+    telemetry.stop()
+    screen_api.stop()
     pygame.quit()
+    if asset_bundle is not None:
+        asset_bundle.close()
@@ -0,0 +1,116 @@
+"""
+Asset Pipeline
+==============
+
+This module defines the AssetManager class, which loads images once,
+converts them to the display's pixel format and scales them to the
+size they are drawn at on the actual screen.
+
+Scaled variants are cached on disk as raw pixel data keyed by the
+hash of the source file and the target size, so later boots skip
+both the PNG decode and the smoothscale. Images present in an
+AssetBundle (core/bundle.py) are read from the mapped bundle instead
+of loose files.
+
+Author: Wizard Pinball contributors
+Project: University of Idaho PLC Pinball
+Last Updated: 10/19/2026
+"""
+
+import hashlib
+import os
+import struct
+from typing import Dict, Optional, Tuple
+
+import pygame
+
+# header of a cached variant: width, height, has alpha
+CACHE_HEADER = struct.Struct("<IIB")
+
+
+class AssetManager:
+    """
+    Loads and caches display-ready surfaces.
+    Must be created after pygame.display.set_mode().
+    """
+    def __init__(self, asset_dir: str, cache_dir: Optional[str] = None, bundle=None):
+        """
+        :param asset_dir: Root directory of the source assets.
+        :param cache_dir: Where scaled variants are stored; None disables the disk cache.
+        :param bundle: Optional AssetBundle checked before asset_dir.
+        """
+        self.asset_dir = asset_dir
+        self.cache_dir = cache_dir
+        self.bundle = bundle
+        self.images: Dict[Tuple[str, Tuple[int, int]], pygame.Surface] = {}
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def image(self, path: str, size: Optional[Tuple[int, int]] = None) -> pygame.Surface:
+        """
+        Return the image at asset_dir/path converted to the display format,
+        smooth-scaled to size if given. Repeated calls return the same surface.
+        """
+        key = (path, size or (0, 0))
+        surface = self.images.get(key)
+        if surface is None:
+            surface = self._load(path, size)
+            self.images[key] = surface
+        return surface
+
+    def _load(self, path: str, size: Optional[Tuple[int, int]]) -> pygame.Surface:
+        bundle_name = path.replace(os.sep, "/")
+        if self.bundle is not None and bundle_name in self.bundle:
+            digest = self.bundle.entry(bundle_name)["digest"]
+            load = lambda: self.bundle.image(bundle_name)
+        else:
+            full_path = os.path.join(self.asset_dir, path)
+            if not os.path.exists(full_path):
+                raise FileNotFoundError(f"Image file not found: {full_path}")
+            with open(full_path, "rb") as f:
+                digest = hashlib.sha1(f.read()).hexdigest()
+            load = lambda: pygame.image.load(full_path)
+
+        cache_path = None
+        if self.cache_dir and size is not None:
+            cache_path = os.path.join(self.cache_dir, f"{digest[:16]}_{size[0]}x{size[1]}.raw")
+            cached = self._read_cache(cache_path)
+            if cached is not None:
+                return cached
+
+        source = load()
+        has_alpha = bool(source.get_flags() & pygame.SRCALPHA) or source.get_colorkey() is not None
+        if size is not None and size != source.get_size():
+            source = pygame.transform.smoothscale(source.convert_alpha(), size)
+
+        if cache_path is not None:
+            self._write_cache(cache_path, source, has_alpha)
+        return self._convert(source, has_alpha)
+
+    @staticmethod
+    def _convert(surface: pygame.Surface, has_alpha: bool) -> pygame.Surface:
+        # match the display pixel format so blits are plain copies
+        return surface.convert_alpha() if has_alpha else surface.convert()
+
+    def _read_cache(self, cache_path: str) -> Optional[pygame.Surface]:
+        try:
+            with open(cache_path, "rb") as f:
+                width, height, has_alpha = CACHE_HEADER.unpack(f.read(CACHE_HEADER.size))
+                pixels = f.read()
+        except (OSError, struct.error):
+            return None
+        if len(pixels) != width * height * 4:
+            return None
+        surface = pygame.image.frombuffer(pixels, (width, height), "RGBA")
+        return self._convert(surface, bool(has_alpha))
+
+    def _write_cache(self, cache_path: str, surface: pygame.Surface, has_alpha: bool):
+        width, height = surface.get_size()
+        tmp_path = cache_path + ".tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(CACHE_HEADER.pack(width, height, 1 if has_alpha else 0))
+                f.write(pygame.image.tobytes(surface, "RGBA"))
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            print(f"[AssetManager] Could not cache {cache_path}: {e}")
@@ -0,0 +1,210 @@
+"""
+Asset Bundle
+============
+
+This module defines the packed asset bundle: every sound and image
+under assets/ stored in one file with an index, so a cold boot off the
+cabinet's SD card is one sequential read instead of many scattered file
+opens and decodes.
+
+Layout:
+  header   magic, version, offset and size of the index
+  entries  file contents, each aligned to ALIGNMENT bytes
+  index    JSON: name -> offset, size, kind and kind-specific fields
+
+Entry kinds:
+  file  the original file bytes (images, music and anything not pre-decoded)
+  rgba  an image decoded to RGBA pixels ("width", "height")
+  pcm   a sound decoded to mixer samples ("format" = pygame.mixer.get_init())
+
+Images stay encoded by default: decoded RGBA is many times larger than
+the PNG and the scaled variants come from AssetManager's disk cache
+anyway. The builder only writes rgba entries for images listed with
+--raw-image, for art blitted at its native size.
+
+AssetBundle memory-maps the bundle and reads each entry ahead in one
+sequential pass the first time it is used. rgba entries are wrapped by
+pygame in place; pcm entries skip the decode but are copied once into
+the mixer's buffer, and file entries are decoded from an in-memory
+copy. Rebuild the bundle whenever assets/ changes:
+
+    python core/bundle.py --decode
+
+Author: Wizard Pinball contributors
+Project: University of Idaho PLC Pinball
+Last Updated: 10/19/2026
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import mmap
+import os
+import struct
+from typing import Dict, Iterable
+
+import pygame
+
+MAGIC = b"WZB1"
+VERSION = 1
+# magic, version, reserved, index offset, index size
+HEADER = struct.Struct("<4sHHQQ")
+ALIGNMENT = 64
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+SOUND_EXTENSIONS = (".wav", ".mp3", ".ogg")
+# sounds larger than this are music, streamed by pygame.mixer.music, and stay encoded
+DECODE_LIMIT = 1024 * 1024
+
+DEFAULT_ASSET_DIR = os.path.join(os.path.dirname(__file__), "..", "assets")
+DEFAULT_BUNDLE = os.path.join(os.path.dirname(__file__), "..", "data", "assets.bundle")
+
+
+class AssetBundle:
+    """
+    Read-only view of a bundle file. Names are paths relative to the
+    asset directory with forward slashes, e.g. "sounds/chaching.mp3".
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self.file = open(path, "rb")
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, _, index_offset, index_size = HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"Not a version {VERSION} asset bundle: {path}")
+        self.index: Dict[str, dict] = json.loads(bytes(self.map[index_offset:index_offset + index_size]))
+        self.view = memoryview(self.map)
+        print(f"[AssetBundle] Mapped {len(self.index)} assets from {path}")
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.index
+
+    def entry(self, name: str) -> dict:
+        entry = self.index.get(name)
+        if entry is None:
+            raise FileNotFoundError(f"Asset not in bundle: {name}")
+        return entry
+
+    def buffer(self, name: str) -> memoryview:
+        """Slice of the map holding the entry's data, read ahead in one pass."""
+        entry = self.entry(name)
+        start, end = entry["offset"], entry["offset"] + entry["size"]
+        if hasattr(mmap, "MADV_WILLNEED"):
+            page_start = start - start % mmap.PAGESIZE
+            self.map.madvise(mmap.MADV_WILLNEED, page_start, end - page_start)
+        return self.view[start:end]
+
+    def file_object(self, name: str) -> io.BytesIO:
+        """A copy of a "file" entry's original bytes as a file object for pygame's loaders."""
+        if self.entry(name)["kind"] != "file":
+            raise ValueError(f"{name} is pre-decoded, not a file")
+        return io.BytesIO(self.buffer(name))
+
+    def image(self, name: str) -> pygame.Surface:
+        """
+        Surface for an image entry. Pre-decoded pixels are wrapped in place;
+        convert the result before blitting, as with pygame.image.load().
+        """
+        entry = self.entry(name)
+        if entry["kind"] == "rgba":
+            return pygame.image.frombuffer(self.buffer(name), (entry["width"], entry["height"]), "RGBA")
+        return pygame.image.load(self.file_object(name), os.path.basename(name))
+
+    def sound(self, name: str) -> pygame.mixer.Sound:
+        """
+        Sound for a sound entry. Pre-decoded samples are copied into the
+        Sound without decoding; they must match the mixer's format, and a
+        ValueError means the bundle was built for another format.
+        """
+        entry = self.entry(name)
+        if entry["kind"] == "pcm":
+            if tuple(entry["format"]) != pygame.mixer.get_init():
+                raise ValueError(f"{name} was decoded for mixer format {tuple(entry['format'])}, "
+                                 f"mixer is {pygame.mixer.get_init()}")
+            return pygame.mixer.Sound(buffer=self.buffer(name))
+        return pygame.mixer.Sound(file=self.file_object(name))
+
+    def close(self):
+        self.view = None
+        try:
+            self.map.close()
+        except BufferError:
+            # surfaces still wrap the map; it is released with them
+            pass
+        self.file.close()
+
+
+def build_bundle(asset_dir: str, out_path: str, decode: bool = False,
+                 raw_images: Iterable[str] = ()) -> Dict[str, dict]:
+    """
+    Pack every image and sound under asset_dir into out_path.
+    :param decode: Store short sounds as mixer samples.
+    :param raw_images: Names of images to store as RGBA pixels, e.g. "images/bg.png".
+    Returns the index that was written.
+    """
+    raw_images = set(raw_images)
+    paths = []
+    for root, _, files in os.walk(asset_dir):
+        for filename in sorted(files):
+            if filename.lower().endswith(IMAGE_EXTENSIONS + SOUND_EXTENSIONS):
+                paths.append(os.path.join(root, filename))
+    paths.sort()
+
+    if decode:
+        # decoding needs the same mixer format as the game: SoundAPI's defaults
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+        pygame.mixer.init()
+
+    index: Dict[str, dict] = {}
+    tmp_path = out_path + ".tmp"
+    os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0, 0, 0))
+        for path in paths:
+            name = os.path.relpath(path, asset_dir).replace(os.sep, "/")
+            with open(path, "rb") as source:
+                data = source.read()
+            # same key AssetManager uses for its scaled-variant cache
+            entry = {"kind": "file", "digest": hashlib.sha1(data).hexdigest()}
+
+            lower = name.lower()
+            if name in raw_images:
+                surface = pygame.image.load(path)
+                entry.update(kind="rgba", width=surface.get_width(), height=surface.get_height())
+                data = pygame.image.tobytes(surface, "RGBA")
+            elif decode and lower.endswith(SOUND_EXTENSIONS) and len(data) <= DECODE_LIMIT:
+                entry.update(kind="pcm", format=list(pygame.mixer.get_init()))
+                data = pygame.mixer.Sound(path).get_raw()
+
+            padding = -f.tell() % ALIGNMENT
+            f.write(b"\0" * padding)
+            entry.update(offset=f.tell(), size=len(data))
+            f.write(data)
+            index[name] = entry
+
+        index_data = json.dumps(index, sort_keys=True).encode()
+        index_offset = f.tell()
+        f.write(index_data)
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, VERSION, 0, index_offset, len(index_data)))
+    os.replace(tmp_path, out_path)
+    return index
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pack assets/ into a memory-mapped bundle.")
+    parser.add_argument("--assets", default=DEFAULT_ASSET_DIR)
+    parser.add_argument("--out", default=DEFAULT_BUNDLE)
+    parser.add_argument("--decode", action="store_true",
+                        help="pre-decode short sounds (larger bundle, no decode at boot)")
+    parser.add_argument("--raw-image", action="append", default=[], metavar="NAME",
+                        help="store this image as RGBA pixels; only for art blitted at native size")
+    args = parser.parse_args()
+
+    built = build_bundle(args.assets, args.out, decode=args.decode, raw_images=args.raw_image)
+    for asset_name, asset in sorted(built.items()):
+        print(f"{asset['kind']:5} {asset['size']:>10}  {asset_name}")
+    print(f"Wrote {len(built)} assets to {args.out} ({os.path.getsize(args.out)} bytes)")
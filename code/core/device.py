@@ -6,7 +6,7 @@ This module defines the Device class for creating pinball hardware devices.
 
 Author: Kevin Wing
 Project: University of Idaho PLC Pinball
-Last Updated: 3/6/2025
+Last Updated: 10/19/2026
 """
 
 class Device:
@@ -21,3 +21,8 @@ class Device:
         self.direction = direction
         self.score = score
         self.starting_count = 0
+
+    @property
+    def is_counter(self) -> bool:
+        """Input and holding registers hold PLC counter accumulators."""
+        return self.reg_type in ("input_register", "holding_register")
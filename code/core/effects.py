@@ -0,0 +1,159 @@
+"""
+Attract Mode Effects
+====================
+
+This module defines the EffectsEngine class, which draws the attract
+screen background (drifting particle field, pulsing glows and color
+cycling) with NumPy over pygame.surfarray. All particles and pixels
+are computed as whole arrays per frame instead of one draw call per
+object.
+
+The effects layer is rendered at a fraction of the screen resolution
+and scaled up. The engine times itself and steps down to a coarser
+layer and fewer particles when it runs over its frame budget, and
+back up when there is headroom.
+
+Author: Wizard Pinball contributors
+Project: University of Idaho PLC Pinball
+Last Updated: 10/19/2026
+"""
+
+import time
+from typing import List, Optional, Tuple
+
+import pygame
+
+try:
+    import numpy as np
+    import pygame.surfarray
+except ImportError:  # numpy is needed for surfarray
+    np = None
+
+# (layer resolution divisor, particle count), best quality first
+QUALITY_LEVELS = [(2, 3000), (3, 1500), (4, 800), (6, 300)]
+
+# frames to wait after a quality change before judging the frame time again
+SETTLE_FRAMES = 30
+# frames under half the budget before quality is raised again
+RECOVER_FRAMES = 300
+
+
+class EffectsEngine:
+    """
+    Renders the attract background into a target surface.
+    :param size: Screen size in pixels.
+    :param orbs: Glow centers and radii as (x, y, radius) in screen pixels.
+    :param budget_ms: Time the effects may take per frame.
+    """
+    def __init__(self,
+                 size: Tuple[int, int],
+                 orbs: Optional[List[Tuple[int, int, int]]] = None,
+                 budget_ms: float = 8.0,
+                 seed: Optional[int] = None):
+        if np is None:
+            raise ImportError("EffectsEngine requires numpy")
+        self.width, self.height = size
+        self.orbs = orbs or []
+        self.budget_ms = budget_ms
+        self.rng = np.random.default_rng(seed)
+
+        self.frame_ms = 0.0
+        self.settle = SETTLE_FRAMES
+        self.fast_frames = 0
+        self.last_time: Optional[float] = None
+
+        # gold to purple to white, cycled over time
+        i = np.arange(256, dtype=np.float32) / 256
+        gold = np.array([241, 179, 0], np.float32)
+        purple = np.array([130, 40, 220], np.float32)
+        mix = (0.5 + 0.5 * np.cos(2 * np.pi * i))[:, None]
+        self.palette = (gold * mix + purple * (1 - mix)).astype(np.float32)
+
+        self.scaled = pygame.Surface(size)
+        self.level = 0
+        self._configure(0)
+
+    def _configure(self, level: int):
+        self.level = level
+        divisor, count = QUALITY_LEVELS[level]
+        w, h = max(1, self.width // divisor), max(1, self.height // divisor)
+        self.layer_size = (w, h)
+        self.layer = pygame.Surface((w, h))
+        self.intensity = np.zeros((w, h), np.float32)
+
+        # surfarray arrays are indexed [x, y]
+        xs, ys = np.meshgrid(np.arange(w, dtype=np.float32), np.arange(h, dtype=np.float32), indexing="ij")
+        radius = np.hypot(xs - w / 2, ys - h / 2) / max(w, h)
+        self.hue_field = (radius * 512).astype(np.intp)
+
+        glows = []
+        for x, y, r in self.orbs:
+            sigma = max(1.0, r / divisor)
+            d2 = (xs - x / divisor) ** 2 + (ys - y / divisor) ** 2
+            glows.append(np.exp(-d2 / (2 * sigma * sigma)))
+        self.glow_stack = np.stack(glows) if glows else np.zeros((0, w, h), np.float32)
+        self.glow_phase = self.rng.uniform(0, 2 * np.pi, len(glows)).astype(np.float32)
+
+        self.pos = self.rng.random((count, 2), np.float32) * np.array([w, h], np.float32)
+        self.vel = self.rng.normal(0, 4 / divisor, (count, 2)).astype(np.float32)
+        self.vel[:, 1] -= 12 / divisor  # slow upward drift
+        self.bright = self.rng.uniform(0.3, 1.0, count).astype(np.float32)
+        self.twinkle = self.rng.uniform(1.0, 4.0, count).astype(np.float32)
+        self.twinkle_phase = self.rng.uniform(0, 2 * np.pi, count).astype(np.float32)
+
+    def render(self, surface: pygame.Surface):
+        """Draw one frame of the effects over the whole target surface."""
+        start = time.perf_counter()
+        t = pygame.time.get_ticks() / 1000
+        dt = 0.0 if self.last_time is None else min(t - self.last_time, 0.1)
+        self.last_time = t
+        w, h = self.layer_size
+
+        # trails fade out instead of being cleared
+        self.intensity *= 0.8
+
+        self.pos += self.vel * dt
+        np.mod(self.pos, (w, h), out=self.pos)
+        # float32 mod can round a tiny negative position up to exactly w or h
+        cells = np.minimum(self.pos.astype(np.intp), (w - 1, h - 1))
+        index = cells[:, 0] * h + cells[:, 1]
+        weights = self.bright * (0.5 + 0.5 * np.sin(self.twinkle * t + self.twinkle_phase))
+        counts = np.bincount(index, weights=weights, minlength=w * h)[:w * h]
+        self.intensity += counts.reshape(w, h).astype(np.float32)
+
+        level = self.intensity
+        if len(self.glow_stack):
+            pulse = 0.6 * (0.5 + 0.5 * np.sin(t + self.glow_phase))
+            level = level + np.tensordot(pulse, self.glow_stack, axes=1)
+        np.clip(level, 0, 1, out=level)
+
+        shift = int(t * 40)
+        rgb = self.palette[(self.hue_field + shift) & 255] * level[..., None]
+        pygame.surfarray.blit_array(self.layer, rgb.astype(np.uint8))
+        pygame.transform.scale(self.layer, (self.width, self.height), self.scaled)
+        surface.blit(self.scaled, (0, 0))
+
+        self._account((time.perf_counter() - start) * 1000)
+
+    def _account(self, ms: float):
+        """Track the frame time and move between quality levels."""
+        self.frame_ms = ms if self.frame_ms == 0 else 0.9 * self.frame_ms + 0.1 * ms
+        if self.settle > 0:
+            self.settle -= 1
+            return
+
+        if self.frame_ms > self.budget_ms and self.level < len(QUALITY_LEVELS) - 1:
+            self._change_level(self.level + 1)
+        elif self.frame_ms < self.budget_ms / 2 and self.level > 0:
+            self.fast_frames += 1
+            if self.fast_frames >= RECOVER_FRAMES:
+                self._change_level(self.level - 1)
+        else:
+            self.fast_frames = 0
+
+    def _change_level(self, level: int):
+        print(f"[EffectsEngine] Frame time {self.frame_ms:.1f} ms, quality level {self.level} -> {level}")
+        self._configure(level)
+        self.frame_ms = 0.0
+        self.settle = SETTLE_FRAMES
+        self.fast_frames = 0
@@ -4,37 +4,134 @@ Game Event System
 
 This module defines the Game Event system.
 
+Devices are monitored according to their register type:
+  - coils are edge devices and produce "rising"/"falling" events
+  - input/holding registers are PLC counters and produce one
+    batched "count" event per poll carrying the number of hits,
+    or a "reset" event when the PLC clears the counter
+Every change also produces a "changed" event.
+
+A counter that goes down was either cleared by the PLC or counted down
+(ball_drain is an up/down counter; the extra_ball coil takes one off).
+Only a drop to zero, or to at most RESET_WINDOW from well above it, is
+taken as a reset, the value left being hits since the clear. Any other
+decrease is a down count and only produces "changed".
+
+When the PLC runs the event FIFO (core/event_fifo.py), its records are
+handled before the poll snapshot, one at a time in the order the PLC
+logged them and with the PLC's timestamps, so short coil pulses give a
+rising and a falling event and counters give one "count" per hit.
+
 Author: Kevin Wing
 Project: University of Idaho PLC Pinball
-Last Updated: 3/7/2025
+Last Updated: 10/19/2026
 """
 
 import threading
 import time
 from core.modbus_api import ModbusAPI
 
+RISING = "rising"
+FALLING = "falling"
+CHANGED = "changed"
+COUNT = "count"
+RESET = "reset"
+
+# hits a cleared counter may collect before the poll that sees the clear
+RESET_WINDOW = 2
+
+# name suffix used for the no-argument named events of each kind
+EVENT_SUFFIXES = {
+    RISING: "pressed",
+    COUNT: "pressed",
+    FALLING: "released",
+    CHANGED: "changed",
+    RESET: "reset",
+}
+
+class DeviceEvent:
+    """
+    A single input event for one device.
+    :param device: Device name from devices.json.
+    :param kind: One of RISING, FALLING, CHANGED, COUNT or RESET.
+    :param old: Value seen on the previous poll.
+    :param new: Value seen on this poll.
+    :param delta: Number of hits for COUNT events, otherwise new - old.
+    :param timestamp: time.time() of the poll that observed the change, or of
+                      the PLC's event record when the event FIFO is in use.
+    """
+    __slots__ = ("device", "kind", "old", "new", "delta", "timestamp")
+
+    def __init__(self, device: str, kind: str, old: int, new: int, delta: int, timestamp: float):
+        self.device = device
+        self.kind = kind
+        self.old = old
+        self.new = new
+        self.delta = delta
+        self.timestamp = timestamp
+
+    @property
+    def name(self) -> str:
+        return f"{self.device}_{EVENT_SUFFIXES[self.kind]}"
+
+    def __repr__(self):
+        return (f"DeviceEvent({self.device!r}, {self.kind!r}, old={self.old}, "
+                f"new={self.new}, delta={self.delta})")
+
 class EventAPI:
     """
-    Monitors Modbus inputs for changes and emits events on rising edges or value changes.
+    Monitors Modbus inputs for changes and emits events on edges, counts or value changes.
     Allows registering callbacks for specific events.
     """
-    def __init__(self, modbus_api: ModbusAPI):
+    def __init__(self, modbus_api: ModbusAPI, start_thread: bool = True):
+        """
+        :param start_thread: Start the background monitor thread. Pass False to
+                             drive the checks yourself with check_once().
+        """
         self.api = modbus_api
         self.callbacks = {}
+        self.subscribers = {}
         self.last_values = {}
         self.running = True
-        self.thread = threading.Thread(target=self._monitor_loop, daemon=True)
-        self.thread.start()
+        self.heartbeat = None  # optional watchdog Heartbeat beaten once per check
+        self.thread = threading.Thread(target=self._monitor_loop, name="event-monitor", daemon=True)
+        if start_thread:
+            self.thread.start()
 
     def register(self, event_name: str, callback):
+        """
+        Register a no-argument callback for a named event such as
+        "slingshot_pressed" or a custom event passed to emit().
+        """
         if event_name not in self.callbacks:
             self.callbacks[event_name] = []
         self.callbacks[event_name].append(callback)
 
+    def subscribe(self, device_name: str, kind: str, callback):
+        """
+        Register callback(event: DeviceEvent) for one kind of event on a device.
+        :param kind: RISING, FALLING, CHANGED, COUNT or RESET.
+        """
+        key = (device_name, kind)
+        if key not in self.subscribers:
+            self.subscribers[key] = []
+        self.subscribers[key].append(callback)
+
     def _emit(self, event_name: str):
         for callback in self.callbacks.get(event_name, []):
-            callback()
-    
+            try:
+                callback()
+            except Exception as e:
+                print(f"[GameEventSystem] Callback for {event_name} failed: {e}")
+
+    def _dispatch(self, event: DeviceEvent):
+        for callback in self.subscribers.get((event.device, event.kind), []):
+            try:
+                callback(event)
+            except Exception as e:
+                print(f"[GameEventSystem] Subscriber for {event!r} failed: {e}")
+        self._emit(event.name)
+
     def emit(self, event_name: str):
         """Emit custom event"""
         print(f"[GameEventSystem] Emitting Event {event_name}")
@@ -42,18 +139,56 @@ class EventAPI:
 
     def _monitor_loop(self):
         while self.running:
-            current_values = self.api.read_all()
-            for name, current in current_values.items():
-                last = self.last_values.get(name, 0)
-                # if current == 1 and last == 0:
-                #     self._emit(f"{name}_pressed")
-                if current != last:
-                    self._emit(f"{name}_pressed")
-                elif current != last:
-                    self._emit(f"{name}_changed")
-                self.last_values[name] = current
+            self.check_once()
+            if self.heartbeat is not None:
+                self.heartbeat.beat()
             time.sleep(0.05)
 
+    def check_once(self):
+        """Dispatch the events for everything that changed since the last check."""
+        if hasattr(self.api, "read_updates"):
+            snapshot, records = self.api.read_updates()
+        else:
+            snapshot, records = self.api.read_snapshot(), []
+        for name, value, timestamp in records:
+            self._observe(name, value, timestamp)
+
+        timestamp = snapshot.timestamp or time.time()
+        for name, current in snapshot.values.items():
+            if name in self.last_values or name not in snapshot.stale:
+                self._observe(name, current, timestamp)
+
+    def _observe(self, name: str, current: int, timestamp: float):
+        """Compare a new value of a device with the last one and dispatch its events."""
+        last = self.last_values.get(name)
+        self.last_values[name] = current
+        if last is None or current == last:
+            # first reading is the baseline, not an event
+            return
+
+        device = self.api.devices.get(name)
+        if device is not None and device.is_counter:
+            self._counter_events(name, last, current, timestamp)
+        else:
+            kind = RISING if current and not last else FALLING if last and not current else None
+            if kind:
+                self._dispatch(DeviceEvent(name, kind, last, current, current - last, timestamp))
+        self._dispatch(DeviceEvent(name, CHANGED, last, current, current - last, timestamp))
+
+    def _counter_events(self, name: str, last: int, current: int, timestamp: float):
+        if current < last:
+            if current != 0 and not current <= RESET_WINDOW < last - current:
+                # counted down; "changed" covers it
+                return
+            # the PLC cleared the counter; anything above zero was hit since
+            self._dispatch(DeviceEvent(name, RESET, last, current, current - last, timestamp))
+            hits = current
+        else:
+            hits = current - last
+        if hits > 0:
+            self._dispatch(DeviceEvent(name, COUNT, last, current, hits, timestamp))
+
     def stop(self):
         self.running = False
-        self.thread.join()
+        if self.thread.is_alive():
+            self.thread.join()
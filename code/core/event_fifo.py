@@ -0,0 +1,131 @@
+"""
+PLC Event FIFO
+==============
+
+This module defines the EventFifo class, the Pi side of a ring buffer
+of input events kept by the PLC in a block of holding registers. The
+PLC appends one record every time an input changes, stamped with its
+own millisecond clock, so the game sees every edge in order with the
+time it happened, even pulses shorter than the poll interval.
+
+Block layout (holding registers, offsets from the configured address):
+    0   head      next slot the PLC writes
+    1   tail      next slot the Pi reads; the Pi advances it to acknowledge
+    2   dropped   records lost because the ring was full (wraps at 65536)
+    3   clock lo  PLC millisecond clock, updated every scan
+    4   clock hi
+    5   records   capacity slots of (source, value, time lo, time hi)
+
+source is the conventional Modbus reference of the input: the coil
+address for coils (1-9999), 30000 + address for input registers and
+40000 + address for holding registers, with the addresses used in
+devices.json. value is the input's new state: 0/1 for coils and the
+counter value after the hit for counters.
+
+The whole block is read with one request per poll. A PLC that does
+not run the FIFO logic never moves its clock; once the clock has not
+moved for CLOCK_TIMEOUT the reader reports the FIFO as unavailable
+and ModbusAPI polls every device instead.
+
+The FIFO is configured by the "event_fifo" section of devices.json and
+ships with "enabled": false, since the current ladder program does not
+log events; reading the block would only add a 125-register request to
+every sweep. Set it to true once the PLC runs the FIFO logic.
+
+Author: Wizard Pinball contributors
+Project: University of Idaho PLC Pinball
+Last Updated: 10/19/2026
+"""
+
+from typing import List, Optional, Tuple
+
+HEAD, TAIL, DROPPED, CLOCK_LO, CLOCK_HI = range(5)
+HEADER_WORDS = 5
+RECORD_WORDS = 4
+# a Modbus read returns at most 125 registers
+MAX_CAPACITY = (125 - HEADER_WORDS) // RECORD_WORDS
+# seconds without a clock change before the FIFO is considered down
+CLOCK_TIMEOUT = 1.0
+
+SOURCE_BASES = {
+    "coil": 0,
+    "input_register": 30000,
+    "holding_register": 40000,
+}
+
+
+def source_code(reg_type: str, address: int) -> int:
+    """FIFO source code of a device, from its devices.json reg_type and address."""
+    return SOURCE_BASES[reg_type] + address
+
+
+class EventFifo:
+    """
+    Reads and acknowledges the PLC's event ring.
+    :param address: First holding register of the block (devices.json numbering, 1-based).
+    :param capacity: Number of record slots the PLC was programmed with.
+    """
+    def __init__(self, address: int, capacity: int):
+        if not 1 < capacity <= MAX_CAPACITY:
+            raise ValueError(f"Event FIFO capacity must be 2-{MAX_CAPACITY}, got {capacity}")
+        self.address = address
+        self.capacity = capacity
+        self.size = HEADER_WORDS + capacity * RECORD_WORDS
+
+        self.tail: Optional[int] = None   # our read position; None while the FIFO is down
+        self.last_clock: Optional[int] = None
+        self.clock_changed: Optional[float] = None  # read_time the clock was last seen moving
+        self.dropped: Optional[int] = None
+        self.live = False
+        self.overflowed = False  # set when the PLC dropped records since the last read
+
+    def read(self, connection, read_time: float) -> Optional[List[Tuple[int, int, float]]]:
+        """
+        Fetch the new records and acknowledge them.
+        :param connection: PLCConnection to issue the requests on.
+        :param read_time: time.time() of the read, used to date the records.
+        Returns (source, value, timestamp) tuples oldest first, or None when
+        the FIFO is not available and the caller must poll the inputs.
+        """
+        client = connection.client
+        block = connection.request(client.read_holding_registers, self.address - 1, self.size)
+        if not block or len(block) != self.size:
+            self.live = False
+            return None
+
+        clock = block[CLOCK_LO] | block[CLOCK_HI] << 16
+        head = block[HEAD]
+        if self.last_clock is not None and clock != self.last_clock:
+            self.clock_changed = read_time
+        self.last_clock = clock
+        was_live = self.live
+        self.live = (self.clock_changed is not None and read_time - self.clock_changed < CLOCK_TIMEOUT
+                     and head < self.capacity)
+        if not self.live:
+            self.tail = None
+            return None
+
+        self.overflowed = was_live and block[DROPPED] != self.dropped
+        if self.overflowed:
+            lost = (block[DROPPED] - self.dropped) & 0xFFFF
+            print(f"[EventFifo] PLC dropped {lost} events, ring full")
+        self.dropped = block[DROPPED]
+        if self.tail is None:
+            # the sweeps before the FIFO came up already saw the backlog; skip it
+            self.tail = head
+
+        records = []
+        slot = self.tail
+        while slot != head:
+            offset = HEADER_WORDS + slot * RECORD_WORDS
+            source, value, time_lo, time_hi = block[offset:offset + RECORD_WORDS]
+            age_ms = (clock - (time_lo | time_hi << 16)) & 0xFFFFFFFF
+            records.append((source, value, read_time - age_ms / 1000))
+            slot = (slot + 1) % self.capacity
+        self.tail = head
+
+        # a lost acknowledge leaves the PLC's tail behind; we keep reading from
+        # our own tail and acknowledge again on the next read
+        if records or block[TAIL] != head:
+            connection.request(client.write_single_register, self.address - 1 + TAIL, head)
+        return records
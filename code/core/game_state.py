@@ -8,16 +8,21 @@ changing the game state based on certain events and
 triggering other modules to update to new values.
 This also will trigger state change in the PLC directly.
 
+The game flow is declared as tables for the StateMachine in
+core/state_machine.py. Events arrive from the EventAPI thread,
+are queued, and are dispatched on the main thread in update().
+
 Author: Kevin Wing
 Project: University of Idaho PLC Pinball
-Last Updated: 4/17/2025
+Last Updated: 10/19/2026
 """
 
-import time
+from collections import deque
+from enum import IntEnum
 import pygame
-import os
-import time
-# previous_state = 'attract'
+
+from core.state_machine import StateMachine, StateDef, Transition
+from core.timer_wheel import TimerWheel
 
 # from typing import TYPE_CHECKING
 
@@ -27,6 +32,24 @@ import time
     # from core.screen_api import ScreenAPI
     # from core.event_api import EventAPI
 
+# How long the game over screen stays up before returning to attract
+GAME_OVER_TIMEOUT_MS = 10000
+
+
+class State(IntEnum):
+    ATTRACT = 0
+    PLAY = 1
+    GAME_OVER = 2
+
+
+class Event(IntEnum):
+    START_PRESSED = 0
+    START_RELEASED = 1
+    BALL_DRAINED = 2
+    LAST_BALL_DRAINED = 3
+    GAME_OVER_TIMEOUT = 4
+
+
 class GameStateController:
     """
     Manages the overall state of the game and transitions based on events
@@ -36,105 +59,176 @@ class GameStateController:
                  screen_api,
                  event_api,
                  modbus_api,
-                 sound_api):
+                 sound_api,
+                 high_score_store=None,
+                 telemetry=None):
         """
         Initializes the GameStateController with the necessary APIs.
         :param screen_api: Instance of PinballScreenAPI for screen updates.
         :param event_system: Instance of GameEventSystem for event handling.
         :param modbus_api: Instance of ModbusClientAPI for Modbus communication.
         :param sound_api: Instance of SoundAPI for sound playback.
+        :param high_score_store: Optional HighScoreStore that final scores are recorded to.
+        :param telemetry: Optional Telemetry that transitions, balls and games are recorded to.
         """
         self.screen_api = screen_api
         self.event_api = event_api
         self.modbus_api = modbus_api
         self.sound_api = sound_api
-        
-        self.state = "attract"
-        self.previous_state = 'attract'
+        self.high_score_store = high_score_store
+        self.telemetry = telemetry
+
         self.score = 0
         self.num_balls = 3
         self.current_ball = 1
-        self.game_over_elapsed_time = 0
+
+        # per-game statistics for the high score store
+        self.device_hits = {}
+        self.ball_times = []
+        self.ball_elapsed_time = 0
 
         self.last_sling_time = 0
 
+        # events queued by the EventAPI thread, drained in update()
+        self.pending_events = deque()
+
+        # translate raw "{device}_pressed" event names into state machine events
+        self.event_decoders = {
+            "start_button_pressed": lambda: Event.START_PRESSED,
+            "start_button_released": lambda: Event.START_RELEASED,
+            "ball_drain_pressed": self._decode_ball_drain,
+        }
+
+        self.timer_wheel = TimerWheel(tick_ms=50)
+        self.machine = StateMachine(
+            states=[
+                StateDef(State.ATTRACT, on_enter=self._enter_attract),
+                StateDef(State.PLAY),
+                StateDef(State.GAME_OVER,
+                         on_enter=self._enter_game_over,
+                         on_exit=self._reset_game,
+                         timeout_ms=GAME_OVER_TIMEOUT_MS,
+                         timeout_event=Event.GAME_OVER_TIMEOUT),
+            ],
+            transitions={
+                State.ATTRACT: {
+                    Event.START_PRESSED: Transition(State.PLAY, self._start_game),
+                },
+                State.PLAY: {
+                    Event.BALL_DRAINED: Transition(None, self._load_ball),
+                    Event.LAST_BALL_DRAINED: Transition(State.GAME_OVER),
+                    Event.START_RELEASED: Transition(State.ATTRACT, self._abort_game),
+                },
+                State.GAME_OVER: {
+                    Event.START_PRESSED: Transition(State.PLAY, self._start_game),
+                    Event.GAME_OVER_TIMEOUT: Transition(State.ATTRACT),
+                },
+            },
+            initial=State.ATTRACT,
+            timer_wheel=self.timer_wheel,
+        )
+        self.machine.on_transition = self._on_transition
+
     def handle_event(self, event_name: str):
-        print(f"[GameStateController] Handling event: {event_name}")
-
-        # attract state
-        if self.state == "attract":
-            
-            # get music playing if not already
-            if pygame.mixer.music.get_busy() is False:
-                self.sound_api.set_background_music("fight_song.wav", volume=1.0)
-            
-            
-
-            if event_name == "start_button_pressed":
-                print("Transitioning to play mode")
-                self.state = "play"
-                self.sound_api.set_background_music("pinball_wizard.wav", volume=1.0)
-
-                self.score = 0
-                self.modbus_api.write_value("drop_target_reset", True)
-                self.modbus_api.write_value("load_ball", True)
-            # reset previous state
-            if self.previous_state != 'attract':
-                self.previous_state = 'attract'
-
-        # play state
-        elif self.state == "play":
-
-            # check if event is ball_drain and lose condition
-            if event_name == "ball_drain_pressed":
-                print("Ball drained")
-                current_ball = self.modbus_api.read_value('ball_drain')
-                if current_ball < self.num_balls:
-                    # self.current_ball += 1
-                    print(f"Ball {self.current_ball}")
-                    self.modbus_api.write_value("load_ball", True)
-                else:
-                    print("Game Over")
-                    self.state = "game_over"
-                    self.previous_state = 'play'
-                    self.game_over_elapsed_time = 0
-                    self.modbus_api.write_value("game_over_bit", True)
-                    time.sleep(10)
-                    
-            if self.previous_state == 'attract':
-                self.previous_state = 'play'
-
-        # game over state
-        elif self.state == "game_over":
-            if event_name == "start_button_pressed":
-                print("Restarting game")
-                self.state = "play"
-                self.previous_state = 'game_over'
-
-            elif event_name == "game_over_timeout":
-                print("Transitioning to attract state")
-                self.state = "attract"
-                self.previous_state = 'game_over'
-
-            if self.state == "attract" or self.state == "play":
-                self.score = 0
-                self.game_over_elapsed_time = 0
+        """
+        Queue an event for the next update(). Safe to call from the
+        EventAPI thread; never blocks.
+        """
+        self.pending_events.append(event_name)
+
+    def _dispatch(self, event_name: str):
+        decoder = self.event_decoders.get(event_name)
+        if decoder is None:
+            return
+        event_id = decoder()
+        if event_id is None:
+            return
+        print(f"[GameStateController] Handling event: {event_name} ({event_id.name})")
+        self.machine.dispatch(event_id)
+
+    def _decode_ball_drain(self):
+        drained = self.modbus_api.read_value("ball_drain")
+        if drained < self.num_balls:
+            return Event.BALL_DRAINED
+        return Event.LAST_BALL_DRAINED
+
+    # ---- actions ----
+
+    def _play_music(self, filename: str):
+        try:
+            self.sound_api.set_background_music(filename, volume=1.0)
+        except FileNotFoundError as e:
+            print(f"[GameStateController] {e}")
+
+    def _enter_attract(self):
+        print("Transitioning to attract state")
+        # get music playing if not already
+        if pygame.mixer.music.get_busy() is False:
+            self._play_music("fight_song.mp3")
+
+    def _start_game(self):
+        print("Transitioning to play mode")
+        self._play_music("pinball_wizard.wav")
+        self._reset_game()
+        self.modbus_api.write_value("drop_target_reset", True)
+        self.modbus_api.write_value("load_ball", True)
+
+    def _load_ball(self):
+        print("Ball drained")
+        self._end_ball()
+        self.current_ball += 1
+        print(f"Ball {self.current_ball}")
+        self.modbus_api.write_value("load_ball", True)
+
+    def _end_ball(self):
+        self.ball_times.append(self.ball_elapsed_time)
+        if self.telemetry is not None:
+            self.telemetry.record_ball(self.current_ball, self.ball_elapsed_time)
+        self.ball_elapsed_time = 0
+
+    def _on_transition(self, old_state: State, new_state: State):
+        # runs before any exit/entry action, so the score is still intact
+        if old_state == State.PLAY:
+            self._end_ball()
+        if self.telemetry is None:
+            return
+        self.telemetry.record_transition(old_state, new_state)
+        if new_state == State.PLAY:
+            self.telemetry.start_game()
+        elif old_state == State.PLAY:
+            self.telemetry.end_game(self.score)
+
+    def _enter_game_over(self):
+        print("Game Over")
+        self.modbus_api.write_value("game_over_bit", True)
+        if self.high_score_store is not None:
+            self.high_score_store.record("Player", self.score,
+                                         device_hits=self.device_hits,
+                                         ball_times=self.ball_times)
+
+    def _abort_game(self):
+        print("[GameStateController] Start button released — returning to attract mode")
+        self._reset_game()
+
+    def _reset_game(self):
+        self.score = 0
+        self.current_ball = 1
+        self.device_hits = {}
+        self.ball_times = []
+        self.ball_elapsed_time = 0
+
+    # ---- per-frame ----
 
     def update(self, delta_time: int):
-        all_values = self.modbus_api.read_all()
+        self.machine.start()
+
+        while self.pending_events:
+            self._dispatch(self.pending_events.popleft())
 
-        # Check for low start_button coil
-        start_button_val = all_values.get("start_button", 1)  # assume 1 if missing
-        if self.state == "play" and start_button_val == 0:
-            print("[GameStateController] Start button released — returning to attract mode")
-            self.state = "attract"
-            self.previous_state = "play"
-            self.score = 0
-            self.current_ball = 1
-            self.game_over_elapsed_time = 0
-            return  # skip further updates this tick
-
-        if self.state == "play":
+        self.machine.update(delta_time)
+
+        if self.machine.state == State.PLAY:
+            self.ball_elapsed_time += delta_time
             self.update_score()
 
     def update_score(self):
@@ -145,6 +239,7 @@ class GameStateController:
                 count = all_values.get(name, 0)
                 delta = count - device.starting_count
                 if delta > 0:
+                    self.device_hits[name] = self.device_hits.get(name, 0) + delta
                     self.sound_api.play("chaching")
                     print(f"[DEBUG] Scored {delta} hits from {name} x {device.score}")
                 total += count * device.score
@@ -160,7 +255,10 @@ class GameStateController:
     #         self.last_sling_time = now
 
     def get_state(self):
-        return self.state
+        return self.machine.state.name.lower()
+
+    def get_previous_state(self):
+        return self.machine.previous_state.name.lower()
 
     def get_ball(self):
         return self.current_ball
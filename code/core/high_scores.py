@@ -0,0 +1,165 @@
+"""
+High Score Store
+================
+
+This module defines the HighScoreStore class, which keeps the
+top-N scores in memory for the screens and persists every finished
+game (score, per-device hit counts and ball times) to SQLite on a
+background write-behind thread.
+
+SQLite runs in WAL mode with synchronous=FULL and each game is
+written in a single transaction, so a power cut loses at most the
+game that was being written and never corrupts the file.
+
+Author: Wizard Pinball contributors
+Project: University of Idaho PLC Pinball
+Last Updated: 10/19/2026
+"""
+
+import heapq
+import os
+import queue
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    name        TEXT    NOT NULL,
+    score       INTEGER NOT NULL,
+    played_at   REAL    NOT NULL
+);
+CREATE INDEX IF NOT EXISTS games_score ON games (score DESC);
+CREATE TABLE IF NOT EXISTS device_hits (
+    game_id     INTEGER NOT NULL REFERENCES games (id),
+    device      TEXT    NOT NULL,
+    hits        INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS ball_times (
+    game_id     INTEGER NOT NULL REFERENCES games (id),
+    ball        INTEGER NOT NULL,
+    duration_ms INTEGER NOT NULL
+);
+"""
+
+
+class GameRecord:
+    """A finished game waiting to be written by the write-behind thread."""
+    __slots__ = ("name", "score", "played_at", "device_hits", "ball_times")
+
+    def __init__(self, name: str, score: int, played_at: float,
+                 device_hits: Dict[str, int], ball_times: List[int]):
+        self.name = name
+        self.score = score
+        self.played_at = played_at
+        self.device_hits = device_hits
+        self.ball_times = ball_times
+
+
+class HighScoreStore:
+    """
+    In-memory top-N table backed by SQLite.
+    record() only touches the heap and a queue, so it is safe to call
+    from the render loop; all disk I/O happens on the writer thread.
+    """
+    def __init__(self, db_path: str, top_n: int = 10):
+        self.db_path = db_path
+        self.top_n = top_n
+        self.lock = threading.Lock()
+        # min-heap of (score, -played_at, name): the root is the entry to evict
+        self.heap: List[Tuple[int, float, str]] = []
+        self.queue: "queue.Queue[Optional[GameRecord]]" = queue.Queue()
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._load_top()
+
+        self.running = True
+        self.thread = threading.Thread(target=self._writer_loop, daemon=True)
+        self.thread.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=FULL")
+        conn.executescript(SCHEMA)
+        return conn
+
+    def _load_top(self):
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT name, score, played_at FROM games ORDER BY score DESC, played_at ASC LIMIT ?",
+                (self.top_n,)).fetchall()
+        finally:
+            conn.close()
+        for name, score, played_at in rows:
+            self._push(name, score, played_at)
+
+    def _push(self, name: str, score: int, played_at: float):
+        entry = (score, -played_at, name)
+        if len(self.heap) < self.top_n:
+            heapq.heappush(self.heap, entry)
+        elif entry > self.heap[0]:
+            heapq.heapreplace(self.heap, entry)
+
+    def record(self, name: str, score: int,
+               device_hits: Optional[Dict[str, int]] = None,
+               ball_times: Optional[List[int]] = None):
+        """
+        Record a finished game. Never blocks on disk.
+        :param device_hits: Hit count per device name for this game.
+        :param ball_times: Duration of each ball in milliseconds.
+        """
+        played_at = time.time()
+        with self.lock:
+            self._push(name, score, played_at)
+        self.queue.put_nowait(GameRecord(name, score, played_at,
+                                         dict(device_hits or {}), list(ball_times or [])))
+
+    def top(self) -> List[Tuple[str, int]]:
+        """Return the top-N as (name, score), highest first."""
+        with self.lock:
+            entries = sorted(self.heap, reverse=True)
+        return [(name, score) for score, _, name in entries]
+
+    def is_high_score(self, score: int) -> bool:
+        with self.lock:
+            return len(self.heap) < self.top_n or score > self.heap[0][0]
+
+    def _writer_loop(self):
+        conn = self._connect()
+        try:
+            while True:
+                record = self.queue.get()
+                if record is None:
+                    break
+                try:
+                    self._write(conn, record)
+                except sqlite3.Error as e:
+                    print(f"[HighScoreStore] Failed to save game: {e}")
+        finally:
+            conn.close()
+
+    def _write(self, conn: sqlite3.Connection, record: GameRecord):
+        with conn:
+            cur = conn.execute(
+                "INSERT INTO games (name, score, played_at) VALUES (?, ?, ?)",
+                (record.name, record.score, record.played_at))
+            game_id = cur.lastrowid
+            conn.executemany(
+                "INSERT INTO device_hits (game_id, device, hits) VALUES (?, ?, ?)",
+                [(game_id, device, hits) for device, hits in record.device_hits.items()])
+            conn.executemany(
+                "INSERT INTO ball_times (game_id, ball, duration_ms) VALUES (?, ?, ?)",
+                [(game_id, i + 1, ms) for i, ms in enumerate(record.ball_times)])
+
+    def stop(self):
+        """Flush pending games and stop the writer thread."""
+        if self.running:
+            self.running = False
+            self.queue.put(None)
+            self.thread.join()
@@ -2,59 +2,198 @@
 import json
 import threading
 import time
-from typing import Dict
-from pyModbusTCP.client import ModbusClient
+from collections import deque
+from typing import Dict, List, Optional, Set, Tuple
 from core.device import Device
+from core.event_fifo import EventFifo, source_code
+from core.plc_connection import PLCConnection, Health
+
+# FIFO records waiting for EventAPI; older ones are dropped if nobody reads them
+MAX_PENDING_RECORDS = 4096
+
+def load_devices(path: str) -> Dict[str, Device]:
+    """Read the device table from a devices.json config file, in file order."""
+    with open(path, 'r') as f:
+        config = json.load(f)
+
+    devices = {}
+    for name, props in config.get("devices", {}).items():
+        score = props.get("score", 0)
+        device = Device(
+            name=name,
+            address=props["address"],
+            reg_type=props["reg_type"],
+            direction=props["direction"],
+            score=score
+        )
+        devices[name] = device
+    return devices
+
+def load_event_fifo(path: str) -> Optional[EventFifo]:
+    """
+    Read the optional "event_fifo" section of a devices.json config file:
+    {"enabled": bool, "address": first holding register, "capacity": record slots}.
+    Returns None if the section is missing or not enabled.
+    """
+    with open(path, 'r') as f:
+        section = json.load(f).get("event_fifo")
+    if not section or not section.get("enabled", False):
+        return None
+    return EventFifo(section["address"], section["capacity"])
+
+class Snapshot:
+    """
+    Copy of the latest input values along with their freshness.
+    :param values: Last known value for each device.
+    :param stale: Names of devices whose value was not refreshed in the last sweep.
+    :param online: Whether the PLC connection was up when the snapshot was taken.
+    """
+    __slots__ = ("values", "stale", "online", "timestamp")
+
+    def __init__(self, values: Dict[str, int], stale: Set[str], online: bool, timestamp: float):
+        self.values = values
+        self.stale = stale
+        self.online = online
+        self.timestamp = timestamp
 
 class ModbusAPI:
-    def __init__(self, host: str, port: int, config_path: str, poll_interval: float = 0.1):
+    def __init__(self, host: str, port: int, config_path: str, poll_interval: float = 0.1,
+                 timeout: float = 0.25, cycle_budget: float = 0.5, start_thread: bool = True,
+                 transport=None, use_event_fifo: bool = True):
+        """
+        :param timeout: Socket timeout for a single Modbus request.
+        :param cycle_budget: Maximum time one poll sweep may spend on I/O; devices
+                             not reached before the deadline keep their last value
+                             and are flagged stale. The next sweep starts with the
+                             first device not reached, so every device is read in
+                             turn even when a sweep cannot cover them all.
+        :param start_thread: Start the background poll thread. Pass False to drive
+                             polling yourself with poll_once().
+        :param transport: Modbus transport to use instead of a TCP ModbusClient,
+                          e.g. a SimulatedPLC.
+        :param use_event_fifo: Consume the PLC's event ring if the config has one.
+                               The ring allows a single consumer, since reading
+                               acknowledges the records; tools running next to the
+                               game (server/monitor.py) must pass False and poll.
+
+        If the config has an enabled "event_fifo" section, every sweep first
+        reads the PLC's event ring (see core/event_fifo.py). While the ring is
+        live, input devices take their values from its records instead of being
+        polled, and the records are kept in order for read_updates(). Otherwise,
+        and after the PLC reports dropped records, every device is polled as before.
+        """
         self.host = host
         self.port = port
         self.poll_interval = poll_interval
+        self.cycle_budget = cycle_budget
         self.lock = threading.Lock()
-        self.client = ModbusClient(host=host, port=port, auto_open=True)
+        self.connection = PLCConnection(host, port, timeout=timeout, transport=transport)
+        self.client = self.connection.client
         self.devices: Dict[str, Device] = {}
         self.inputs: Dict[str, int] = {}
+        self.stale: Set[str] = set()
+        self.last_sweep = 0.0
+        self.sweep_ms = 0.0
+        self.rtt_ms: Dict[str, float] = {}
+        self.next_device = 0  # index in self.devices where the next sweep starts
+        self.records = deque(maxlen=MAX_PENDING_RECORDS)
         self.running = True
+        self.heartbeat = None  # optional watchdog Heartbeat beaten once per sweep
+
+        self.readers = {
+            "coil": self.client.read_coils,
+            "input_register": self.client.read_input_registers,
+            "holding_register": self.client.read_holding_registers,
+        }
 
         self._load_config(config_path)
-        self.thread = threading.Thread(target=self._poll_loop, daemon=True)
-        self.thread.start()
+        self.fifo = load_event_fifo(config_path) if use_event_fifo else None
+        # FIFO source code -> name of every input device the PLC logs
+        self.fifo_sources = {source_code(device.reg_type, device.address): device.name
+                             for device in self.devices.values() if device.direction == "input"}
+        self.stale = set(self.devices)
+        self.connection.on_health_change = self._on_health_change
+        self.thread = threading.Thread(target=self._poll_loop, name="modbus-poll", daemon=True)
+        if start_thread:
+            self.thread.start()
 
     def _load_config(self, path: str):
-        with open(path, 'r') as f:
-            config = json.load(f)
-
-        for name, props in config.get("devices", {}).items():
-            score = props.get("score", 0)
-            device = Device(
-                name=name,
-                address=props["address"],
-                reg_type=props["reg_type"],
-                direction=props["direction"],
-                score=score
-            )
-            self.devices[name] = device
+        self.devices.update(load_devices(path))
+
+    def _on_health_change(self, health: Health):
+        print(f"[ModbusClientAPI] PLC connection {health.name}")
+        if health != Health.ONLINE:
+            with self.lock:
+                self.stale = set(self.devices)
 
     def _poll_loop(self):
         while self.running:
-            with self.lock:
-                for device in self.devices.values():
-                    if device.reg_type == "coil":
-                        result = self.client.read_coils(device.address-1, 1)
-                    elif device.reg_type == "input_register":
-                        result = self.client.read_input_registers(device.address-1, 1)
-                    elif device.reg_type == "holding_register":
-                        result = self.client.read_holding_registers(device.address-1, 1)
-                    else:
-                        result = None
-                    
-                    if result:
-                        self.inputs[device.name] = int(result[0])
-                    else:
-                        self.inputs[device.name] = 0
+            self.poll_once()
+            if self.heartbeat is not None:
+                self.heartbeat.beat()
             time.sleep(self.poll_interval)
 
+    def poll_once(self):
+        """Reconnect if needed, drain the event FIFO and run one sweep."""
+        self.connection.maintain()
+        deadline = time.monotonic() + self.cycle_budget
+        covered: Set[str] = set()
+        if self.fifo is not None and self.connection.is_online():
+            records = self.fifo.read(self.connection, time.time())
+            if records is not None:
+                self._apply_records(records)
+                if not self.fifo.overflowed:
+                    covered = set(self.fifo_sources.values())
+        self._sweep(deadline, skip=covered)
+
+    def _apply_records(self, records: List[Tuple[int, int, float]]):
+        """Queue FIFO records as (device, value, timestamp) and update the inputs in order."""
+        with self.lock:
+            for source, value, timestamp in records:
+                name = self.fifo_sources.get(source)
+                if name is None:
+                    print(f"[ModbusClientAPI] FIFO record from unknown source {source}")
+                    continue
+                self.inputs[name] = value
+                self.records.append((name, value, timestamp))
+
+    def _sweep(self, deadline: float, skip: Set[str] = frozenset()):
+        """
+        Read every device once, except those in skip, starting where the last
+        sweep stopped. Stops at the first lost connection or when the deadline
+        passes; the network I/O happens without holding self.lock.
+        """
+        results = {}
+        rtt_ms = {}
+        sweep_start = time.perf_counter()
+        devices = list(self.devices.values())
+        start_index = self.next_device % len(devices) if devices else 0
+        for i in range(len(devices)):
+            if not self.connection.is_online() or time.monotonic() > deadline:
+                # resume here next sweep so the devices at the end are not starved
+                self.next_device = (start_index + i) % len(devices)
+                break
+            device = devices[(start_index + i) % len(devices)]
+            if device.name in skip:
+                continue
+            reader = self.readers.get(device.reg_type)
+            if reader is None:
+                continue
+            start = time.perf_counter()
+            result = self.connection.request(reader, device.address-1, 1)
+            if result:
+                results[device.name] = int(result[0])
+                rtt_ms[device.name] = (time.perf_counter() - start) * 1000
+        sweep_ms = (time.perf_counter() - sweep_start) * 1000
+
+        with self.lock:
+            self.inputs.update(results)
+            self.rtt_ms.update(rtt_ms)
+            self.sweep_ms = sweep_ms
+            self.stale = {name for name in self.devices if name not in results and name not in skip}
+            if results:
+                self.last_sweep = time.time()
+
     def read_value(self, name: str) -> int:
         with self.lock:
             return self.inputs.get(name, 0)
@@ -62,50 +201,65 @@ class ModbusAPI:
     def read_all(self) -> Dict[str, int]:
         with self.lock:
             return dict(self.inputs)
-    
+
+    def read_snapshot(self) -> Snapshot:
+        """Return the latest values together with stale flags and link health."""
+        with self.lock:
+            return Snapshot(dict(self.inputs), set(self.stale),
+                            self.connection.is_online(), self.last_sweep)
+
+    def read_updates(self) -> Tuple[Snapshot, List[Tuple[str, int, float]]]:
+        """
+        Return the latest snapshot together with the FIFO records received
+        since the last call, oldest first, taken atomically so the snapshot
+        never shows a value whose record has not been returned yet.
+        """
+        with self.lock:
+            records = list(self.records)
+            self.records.clear()
+            return Snapshot(dict(self.inputs), set(self.stale),
+                            self.connection.is_online(), self.last_sweep), records
+
+    def is_online(self) -> bool:
+        return self.connection.is_online()
+
+    def read_timings(self):
+        """Return (last sweep duration, {device: last request round trip}) in milliseconds."""
+        with self.lock:
+            return self.sweep_ms, dict(self.rtt_ms)
+
     def write_value(self, name: str, value: int):
         """
         Set a coil value (0 or 1) by device name.
         Only works on devices defined as coils with direction 'output'.
+        Fails immediately while the PLC is offline.
         """
-        with self.lock:
-            device = self.devices.get(name)
-            if not device:
-                print(f"[ModbusClientAPI] Device '{name}' not found.")
-                return False
-            if device.reg_type != "coil" or device.direction != "output":
-                print(f"[ModbusClientAPI] Device '{name}' is not a writable coil.")
-                return False
-
-            success = self.client.write_single_coil(device.address-1, value)
-            if success:
-                print(f"[ModbusClientAPI] Coil '{name}' set to {value} at address {device.address}")
-            else:
-                print(f"[ModbusClientAPI] Failed to write to coil '{name}' at address {device.address}")
-            return success
+        device = self.devices.get(name)
+        if not device:
+            print(f"[ModbusClientAPI] Device '{name}' not found.")
+            return False
+        if device.reg_type != "coil" or device.direction != "output":
+            print(f"[ModbusClientAPI] Device '{name}' is not a writable coil.")
+            return False
+        if not self.connection.is_online():
+            print(f"[ModbusClientAPI] PLC offline, dropped write to coil '{name}'")
+            return False
+
+        success = self.connection.request(self.client.write_single_coil, device.address-1, value)
+        if success:
+            print(f"[ModbusClientAPI] Coil '{name}' set to {value} at address {device.address}")
+        else:
+            print(f"[ModbusClientAPI] Failed to write to coil '{name}' at address {device.address}")
+        return bool(success)
 
     def stop(self):
         self.running = False
-        self.thread.join()
-        self.client.close()
+        if self.thread.is_alive():
+            self.thread.join()
+        self.connection.close()
 
 if __name__ == "__main__":
-    ip_addr = "192.168.1.10"
-    # ip_addr = "localhost"
-    api = ModbusAPI(ip_addr, 502, "../config/devices.json")
-    try:
-        count = 1
-        while True:
-            print(f"--- Read {count} ---")
-            inputs = api.read_all()
-            for name, val in sorted(inputs.items()):
-                state = "ON  " if val else "OFF "
-                print(f"{name:<15}: {state}")
-            print()
-            time.sleep(0.5)
-            count += 1
-    except KeyboardInterrupt:
-        print("\nStopping Modbus client.")
-    finally:
-        api.stop()
+    # live device view; same as `python server/monitor.py`
+    from server.monitor import main
+    main()
 
@@ -0,0 +1,298 @@
+"""
+Modbus I/O Worker Process
+=========================
+
+This module runs Modbus polling in a separate process so input
+sampling is not delayed by rendering or sound decoding in the game
+process (and vice versa), since the two no longer share a GIL.
+
+The worker publishes every sweep into a shared memory register image
+guarded by a seqlock. Change detection also runs in the worker: every
+value change it sees (event FIFO records in order, then changes found
+by the sweep) is queued as a record on an event ring, so a pulse
+between two of the game's samples is not lost when rendering holds
+the game's GIL. Coil writes travel the other way through a command
+ring. Both rings are single-producer/single-consumer rings in shared
+memory. ProcessModbusAPI is the game-side reader with the same
+interface as ModbusAPI. If the worker dies or stops publishing, the
+reader reports the link offline with every device stale.
+
+Register image layout (little endian):
+    0   uint64  seq        odd while the worker is writing
+    8   float64 timestamp  time.time() of the last good sweep
+    16  uint8   online     1 while the PLC link is up
+    24  int32[n] values    one per device, in devices.json order
+    ..  uint8[n] stale     1 if the value was not refreshed last sweep
+
+Ring layout:
+    0   uint32  head       next slot the producer writes
+    4   uint32  tail       next slot the consumer reads
+    8   item[capacity]
+Command ring items (game -> worker): uint16 device index, uint8 value, pad
+Event ring items (worker -> game): uint16 device index, pad, int32 value,
+    float64 timestamp
+
+Author: Wizard Pinball contributors
+Project: University of Idaho PLC Pinball
+Last Updated: 10/19/2026
+"""
+
+import multiprocessing
+import struct
+import threading
+import time
+from multiprocessing import shared_memory
+from collections import deque
+from typing import Dict, List, Optional, Set
+
+from core.device import Device
+from core.modbus_api import ModbusAPI, Snapshot, load_devices
+
+HEADER = struct.Struct("<QdB7x")
+RING_HEADER = struct.Struct("<II")
+COMMAND = struct.Struct("<HBx")
+EVENT = struct.Struct("<H2xid")
+
+# changes held in the worker while the event ring is full
+MAX_PENDING_EVENTS = 4096
+# a worker whose last good sweep is older than this many poll intervals
+# (and at least WORKER_TIMEOUT seconds) is treated as hung
+WORKER_TIMEOUT = 1.0
+WORKER_TIMEOUT_POLLS = 10
+
+
+class RegisterImage:
+    """Seqlock-protected view of the device values in shared memory."""
+    def __init__(self, num_devices: int, shm: Optional[shared_memory.SharedMemory] = None):
+        self.num_devices = num_devices
+        self.values = struct.Struct(f"<{num_devices}i")
+        self.stale = struct.Struct(f"<{num_devices}B")
+        self.values_offset = HEADER.size
+        self.stale_offset = self.values_offset + self.values.size
+        size = self.stale_offset + self.stale.size
+        self.shm = shm if shm is not None else shared_memory.SharedMemory(create=True, size=size)
+        self.seq = 0
+
+    def publish(self, values: List[int], stale: List[int], online: bool, timestamp: float):
+        """Writer side. Only the worker process calls this."""
+        buf = self.shm.buf
+        self.seq += 1
+        struct.pack_into("<Q", buf, 0, self.seq)
+        # everything after seq, header fields included, is written while seq is odd
+        struct.pack_into("<dB", buf, 8, timestamp, 1 if online else 0)
+        self.values.pack_into(buf, self.values_offset, *values)
+        self.stale.pack_into(buf, self.stale_offset, *stale)
+        self.seq += 1
+        struct.pack_into("<Q", buf, 0, self.seq)
+
+    def read(self):
+        """
+        Reader side. Retries until it copies a consistent image, i.e. the
+        sequence number was even and unchanged across the copy.
+        Returns (values, stale, online, timestamp).
+        """
+        buf = self.shm.buf
+        while True:
+            seq, timestamp, online = HEADER.unpack_from(buf, 0)
+            if seq & 1:
+                time.sleep(0)
+                continue
+            values = self.values.unpack_from(buf, self.values_offset)
+            stale = self.stale.unpack_from(buf, self.stale_offset)
+            if struct.unpack_from("<Q", buf, 0)[0] == seq:
+                return values, stale, bool(online), timestamp
+
+
+class SharedRing:
+    """
+    Single-producer/single-consumer ring of fixed-size items. Each index
+    is only ever written by one side, so no cross-process lock is needed.
+    :param item: Struct of one item, e.g. COMMAND or EVENT.
+    """
+    def __init__(self, item: struct.Struct, capacity: int = 64,
+                 shm: Optional[shared_memory.SharedMemory] = None):
+        self.item = item
+        self.capacity = capacity
+        size = RING_HEADER.size + item.size * capacity
+        self.shm = shm if shm is not None else shared_memory.SharedMemory(create=True, size=size)
+
+    def push(self, *fields) -> bool:
+        """Producer side. Returns False if the ring is full."""
+        buf = self.shm.buf
+        head, tail = RING_HEADER.unpack_from(buf, 0)
+        if (head - tail) & 0xFFFFFFFF >= self.capacity:
+            return False
+        self.item.pack_into(buf, RING_HEADER.size + self.item.size * (head % self.capacity), *fields)
+        struct.pack_into("<I", buf, 0, (head + 1) & 0xFFFFFFFF)
+        return True
+
+    def pop_all(self):
+        """Consumer side. Yields the fields of every queued item, oldest first."""
+        buf = self.shm.buf
+        head, tail = RING_HEADER.unpack_from(buf, 0)
+        while tail != head:
+            yield self.item.unpack_from(buf, RING_HEADER.size + self.item.size * (tail % self.capacity))
+            tail = (tail + 1) & 0xFFFFFFFF
+            struct.pack_into("<I", buf, 4, tail)
+
+
+def _worker_main(host: str, port: int, config_path: str, poll_interval: float,
+                 image: RegisterImage, ring: SharedRing, events: SharedRing, stop_flag):
+    """Entry point of the I/O process: poll, queue changes, publish, apply queued writes."""
+    api = ModbusAPI(host, port, config_path, poll_interval=poll_interval, start_thread=False)
+    names = list(api.devices)
+    indices = {name: i for i, name in enumerate(names)}
+    last: Dict[str, int] = {}
+    pending = deque()
+
+    def changed(name: str, value: int, timestamp: float):
+        if last.get(name) == value:
+            return
+        last[name] = value
+        if len(pending) >= MAX_PENDING_EVENTS:
+            pending.popleft()
+            print("[ModbusWorker] Game is not draining events, dropped the oldest change")
+        pending.append((indices[name], value, timestamp))
+
+    try:
+        while not stop_flag.value:
+            api.poll_once()
+            snapshot, records = api.read_updates()
+            for name, value, timestamp in records:
+                changed(name, value, timestamp)
+            timestamp = snapshot.timestamp or time.time()
+            for name, value in snapshot.values.items():
+                if name in last or name not in snapshot.stale:
+                    changed(name, value, timestamp)
+            # queue the changes before the image shows their values
+            while pending and events.push(*pending[0]):
+                pending.popleft()
+            image.publish([snapshot.values.get(name, 0) for name in names],
+                          [1 if name in snapshot.stale else 0 for name in names],
+                          snapshot.online, snapshot.timestamp)
+            for index, value in ring.pop_all():
+                api.write_value(names[index], value)
+            time.sleep(poll_interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        api.stop()
+        image.shm.close()
+        ring.shm.close()
+        events.shm.close()
+
+
+class ProcessModbusAPI:
+    """
+    Drop-in replacement for ModbusAPI that reads inputs from the worker
+    process's register image instead of polling in a thread.
+    """
+    def __init__(self, host: str, port: int, config_path: str, poll_interval: float = 0.1):
+        self.host = host
+        self.port = port
+        self.poll_interval = poll_interval
+        self.devices: Dict[str, Device] = load_devices(config_path)
+        self.names = list(self.devices)
+        self.indices = {name: i for i, name in enumerate(self.names)}
+        self.write_lock = threading.Lock()  # one producer at a time on the ring
+
+        self.image = RegisterImage(len(self.names))
+        self.image.publish([0] * len(self.names), [1] * len(self.names), False, 0.0)
+        self.ring = SharedRing(COMMAND)
+        self.events = SharedRing(EVENT, capacity=256)
+        self.events_lock = threading.Lock()  # one consumer at a time on the event ring
+        self.latest: Dict[str, int] = {}     # values as of the last change taken off the ring
+        self.worker_timeout = max(WORKER_TIMEOUT, WORKER_TIMEOUT_POLLS * poll_interval)
+        self.worker_lost = False
+
+        # fork keeps the shared memory handles without re-attaching by name;
+        # spawn would re-run the game's __main__ in the child
+        methods = multiprocessing.get_all_start_methods()
+        ctx = multiprocessing.get_context("fork" if "fork" in methods else "spawn")
+        # a plain shared byte rather than ctx.Event: setting it never blocks,
+        # even when the worker died holding the Event's lock
+        self.stop_flag = ctx.RawValue("b", 0)
+        self.process = ctx.Process(
+            target=_worker_main,
+            args=(host, port, config_path, poll_interval, self.image, self.ring, self.events,
+                  self.stop_flag),
+            name="modbus-io",
+            daemon=True,
+        )
+        self.process.start()
+
+    def read_value(self, name: str) -> int:
+        index = self.indices.get(name)
+        if index is None:
+            return 0
+        return self.image.read()[0][index]
+
+    def read_all(self) -> Dict[str, int]:
+        return dict(zip(self.names, self.image.read()[0]))
+
+    def _worker_down(self, online: bool, timestamp: float) -> bool:
+        """True once the worker has exited, or claims online but has not swept in worker_timeout."""
+        down = not self.process.is_alive() or (online and time.time() - timestamp > self.worker_timeout)
+        if down != self.worker_lost:
+            self.worker_lost = down
+            if self.process.exitcode is not None:
+                print(f"[ModbusClientAPI] I/O worker exited with code {self.process.exitcode}")
+            elif down:
+                print("[ModbusClientAPI] I/O worker stopped publishing")
+            else:
+                print("[ModbusClientAPI] I/O worker recovered")
+        return down
+
+    def read_snapshot(self) -> Snapshot:
+        values, stale, online, timestamp = self.image.read()
+        if self._worker_down(online, timestamp):
+            return Snapshot(dict(zip(self.names, values)), set(self.names), False, timestamp)
+        stale_names: Set[str] = {name for name, flag in zip(self.names, stale) if flag}
+        return Snapshot(dict(zip(self.names, values)), stale_names, online, timestamp)
+
+    def read_updates(self):
+        """
+        Return the latest snapshot and the changes the worker saw since the
+        last call as (device, value, timestamp), oldest first. Snapshot values
+        come from the same changes, so they never run ahead of the records.
+        """
+        with self.events_lock:
+            records = []
+            for index, value, timestamp in self.events.pop_all():
+                name = self.names[index]
+                self.latest[name] = value
+                records.append((name, value, timestamp))
+            snapshot = self.read_snapshot()
+            snapshot.values.update(self.latest)
+        return snapshot, records
+
+    def is_online(self) -> bool:
+        _, _, online, timestamp = self.image.read()
+        return online and not self._worker_down(online, timestamp)
+
+    def write_value(self, name: str, value: int):
+        """
+        Queue a coil write for the worker. Same checks as ModbusAPI.write_value;
+        returns once the command is queued, not when the PLC acknowledges it.
+        """
+        device = self.devices.get(name)
+        if not device:
+            print(f"[ModbusClientAPI] Device '{name}' not found.")
+            return False
+        if device.reg_type != "coil" or device.direction != "output":
+            print(f"[ModbusClientAPI] Device '{name}' is not a writable coil.")
+            return False
+        with self.write_lock:
+            queued = self.ring.push(self.indices[name], 1 if value else 0)
+        if not queued:
+            print(f"[ModbusClientAPI] Command ring full, dropped write to coil '{name}'")
+        return queued
+
+    def stop(self):
+        self.stop_flag.value = 1
+        self.process.join(timeout=2.0)
+        if self.process.is_alive():
+            self.process.terminate()
+        for shm in (self.image.shm, self.ring.shm, self.events.shm):
+            shm.close()
+            shm.unlink()
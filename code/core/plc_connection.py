@@ -0,0 +1,125 @@
+"""
+PLC Connection Manager
+======================
+
+This module defines the PLCConnection class, which owns the Modbus
+client and tracks the health of the link to the PLC.
+
+The connection acts as a circuit breaker: the first network failure
+opens the circuit, after which every request fails immediately instead
+of waiting out its own socket timeout. The poll thread calls maintain()
+each cycle to retry the connection with exponential backoff.
+
+Author: Wizard Pinball contributors
+Project: University of Idaho PLC Pinball
+Last Updated: 10/19/2026
+"""
+
+import threading
+import time
+from enum import IntEnum
+from typing import Callable, Optional
+
+from pyModbusTCP.client import ModbusClient
+
+
+class Health(IntEnum):
+    ONLINE = 0       # circuit closed, requests go to the PLC
+    OFFLINE = 1      # circuit open, requests fail fast until the next retry
+    CONNECTING = 2   # a reconnect attempt is in progress
+
+
+class PLCConnection:
+    """
+    Wraps a Modbus transport with a health state machine and reconnect backoff.
+    All client access is serialized through io_lock.
+
+    The transport is anything with the pyModbusTCP ModbusClient interface
+    used here: open(), close(), is_open, last_error_as_txt, read_coils(),
+    read_input_registers(), read_holding_registers(), write_single_coil() and
+    write_single_register().
+    See core/sim_plc.py for an in-memory one.
+    """
+    def __init__(self,
+                 host: str,
+                 port: int,
+                 timeout: float = 0.25,
+                 min_backoff: float = 0.5,
+                 max_backoff: float = 5.0,
+                 transport=None):
+        """
+        :param timeout: Socket timeout for a single request or connect attempt.
+        :param min_backoff: Delay before the first reconnect attempt.
+        :param max_backoff: Upper bound for the reconnect delay.
+        :param transport: Transport to use instead of a TCP ModbusClient.
+        """
+        self.host = host
+        self.port = port
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        if transport is None:
+            transport = ModbusClient(host=host, port=port, timeout=timeout, auto_open=False)
+        self.client = transport
+        self.io_lock = threading.Lock()
+
+        self.health = Health.OFFLINE
+        self.backoff = min_backoff
+        self.next_retry = 0.0
+        self.failures = 0
+        self.on_health_change: Optional[Callable[[Health], None]] = None
+
+    def is_online(self) -> bool:
+        return self.health == Health.ONLINE
+
+    def maintain(self):
+        """
+        Reconnect if the circuit is open and the backoff has elapsed.
+        Called from the poll thread; blocks for at most one connect timeout.
+        """
+        if self.health == Health.ONLINE or time.monotonic() < self.next_retry:
+            return
+        self._set_health(Health.CONNECTING)
+        with self.io_lock:
+            connected = self.client.open()
+        if connected:
+            print(f"[PLCConnection] Connected to {self.host}:{self.port}")
+            self.backoff = self.min_backoff
+            self.failures = 0
+            self._set_health(Health.ONLINE)
+        else:
+            self._trip()
+
+    def request(self, func: Callable, *args):
+        """
+        Run a client call such as client.read_coils, failing fast with None
+        while the circuit is open.
+        """
+        if self.health != Health.ONLINE:
+            return None
+        with self.io_lock:
+            result = func(*args)
+            lost = result is None and not self.client.is_open
+        if lost:
+            print(f"[PLCConnection] Lost connection: {self.client.last_error_as_txt}")
+            self._trip()
+        return result
+
+    def _trip(self):
+        with self.io_lock:
+            self.client.close()
+        self.failures += 1
+        self.next_retry = time.monotonic() + self.backoff
+        self.backoff = min(self.backoff * 2, self.max_backoff)
+        self._set_health(Health.OFFLINE)
+
+    def _set_health(self, health: Health):
+        if health == self.health:
+            return
+        self.health = health
+        if self.on_health_change:
+            self.on_health_change(health)
+
+    def close(self):
+        with self.io_lock:
+            self.client.close()
+        self._set_health(Health.OFFLINE)
@@ -4,13 +4,21 @@ import math
 import random
 
 from core.game_state import GameStateController
+from core.assets import AssetManager
+from core.effects import EffectsEngine
+from core.video import VideoLayer
+
+# Layout coordinates below are in design pixels for a 1920x1080 marquee
+# and are scaled to the actual display with px().
+DESIGN_WIDTH, DESIGN_HEIGHT = 1920, 1080
 
 class ScreenAPI:
-    def __init__(self):
+    def __init__(self, high_score_store=None, asset_bundle=None):
         pygame.init()
         self.WIDTH, self.HEIGHT = pygame.display.Info().current_w, pygame.display.Info().current_h
         self.screen = pygame.display.set_mode((self.WIDTH, self.HEIGHT), pygame.FULLSCREEN)
         pygame.display.set_caption("Wizard Pinball Marquee")
+        self.scale = min(self.WIDTH / DESIGN_WIDTH, self.HEIGHT / DESIGN_HEIGHT)
 
         self.BLACK = (0, 0, 0)
         self.WHITE = (255, 255, 255)
@@ -21,26 +29,52 @@ class ScreenAPI:
         # Get absolute path to the pinball/ root directory
         project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 
-        # Construct path to the logo
-        logo_path = os.path.join(project_root, "assets", "images", "UI_Main_full_color_stacked_RGB.png")
-        # logo_path = "UI_Main_full_color_stacked_RGB.png"
-
-        if not os.path.exists(logo_path):
-            raise FileNotFoundError(f"Logo file not found: {logo_path}")
-        self.logo = pygame.image.load(logo_path)
-        self.logo = pygame.transform.scale(self.logo, (300, 300))
+        # Images are converted to the display format and scaled variants cached on disk
+        self.assets = AssetManager(os.path.join(project_root, "assets"),
+                                   cache_dir=os.path.join(project_root, "data", "asset_cache"),
+                                   bundle=asset_bundle)
+        logo_size = self.px(300)
+        self.logo = self.assets.image("images/UI_Main_full_color_stacked_RGB.png",
+                                      (logo_size, logo_size))
+        self.logo_center_pos = (self.WIDTH // 2 - logo_size // 2, self.HEIGHT // 2)
+        self.logo_bottom_pos = (self.WIDTH // 2 - logo_size // 2, self.HEIGHT - self.px(400))
 
-        self.font = pygame.font.Font(None, 100)
-        self.stats_font = pygame.font.Font(None, 80)
-        self.press_start_font = pygame.font.Font(None, 60)
+        self.font = pygame.font.Font(None, self.px(100))
+        self.stats_font = pygame.font.Font(None, self.px(80))
+        self.press_start_font = pygame.font.Font(None, self.px(60))
 
         self.fixed_stars = [(random.randint(50, self.WIDTH - 50), random.randint(100, self.HEIGHT - 100)) for _ in range(15)]
-        self.flashing_orbs = [(random.randint(100, self.WIDTH - 100), random.randint(150, self.HEIGHT - 150), random.randint(30, 60)) for _ in range(5)]
+        self.flashing_orbs = [(random.randint(100, self.WIDTH - 100), random.randint(150, self.HEIGHT - 150), random.randint(self.px(30), self.px(60))) for _ in range(5)]
+
+        # NumPy effects for the attract background; falls back to plain circles without numpy
+        try:
+            self.effects = EffectsEngine((self.WIDTH, self.HEIGHT), orbs=self.flashing_orbs)
+        except ImportError as e:
+            print(f"[ScreenAPI] Attract effects disabled: {e}")
+            self.effects = None
+
+        # Promo video behind the attract screen, used instead of the effects when present
+        video_path = os.path.join(project_root, "assets", "videos", "attract.mp4")
+        self.video = None
+        if os.path.exists(video_path):
+            try:
+                self.video = VideoLayer(video_path, (self.WIDTH, self.HEIGHT))
+            except (ImportError, ValueError) as e:
+                print(f"[ScreenAPI] Attract video disabled: {e}")
+
+        # shown until the store has recorded some games
+        self.high_scores = [("Gary", 10000), ("Tim", 8500), ("James", 7200)]
+        self.high_score_store = high_score_store
 
+    def px(self, value: float) -> int:
+        """Convert a design-pixel length to screen pixels."""
+        return max(1, int(value * self.scale))
 
-        self.high_scores = [("Gary", 10000), ("Tim", 8500), ("James", 7200)]
+    def update(self, state: str, score: int = 0, ball: int = 0, plc_online: bool = True):
+        if self.video is not None:
+            # decode only while the attract screen can show the video
+            self.video.set_active(state == "attract")
 
-    def update(self, state: str, score: int = 0, ball: int = 0):
         if state == "attract":
             if (pygame.time.get_ticks() // 5000) % 2 == 0:
                 self.draw_attract()
@@ -55,64 +89,82 @@ class ScreenAPI:
         elif state == "high_scores":
             self.draw_high_scores()
 
+        if not plc_online:
+            self.draw_plc_offline()
+        pygame.display.flip()
+
+    def stop(self):
+        if self.video is not None:
+            self.video.stop()
+
+    def draw_plc_offline(self):
+        """Banner drawn over the current screen while the PLC link is down."""
+        if pygame.time.get_ticks() % 1000 < 700:
+            banner = pygame.Rect(0, self.HEIGHT - self.px(120), self.WIDTH, self.px(100))
+            pygame.draw.rect(self.screen, self.RED, banner)
+            offline_text = self.press_start_font.render("PLC OFFLINE", True, self.WHITE)
+            self.screen.blit(offline_text, offline_text.get_rect(center=banner.center))
+
     def draw_attract(self):
-        self.screen.fill(self.BLACK)
-        for star in self.fixed_stars:
-            pygame.draw.circle(self.screen, self.WHITE, star, 2)
-        for orb in self.flashing_orbs:
-            alpha = (math.sin(pygame.time.get_ticks() / 1000) + 1) / 2
-            color = (int(self.YELLOW[0] * alpha), int(self.YELLOW[1] * alpha), int(self.YELLOW[2] * alpha))
-            pygame.draw.circle(self.screen, color, (orb[0], orb[1]), orb[2])
+        frame = self.video.frame() if self.video is not None else None
+        if frame is not None:
+            self.screen.blit(frame, (0, 0))
+        elif self.effects is not None:
+            self.effects.render(self.screen)
+        else:
+            self.screen.fill(self.BLACK)
+            for star in self.fixed_stars:
+                pygame.draw.circle(self.screen, self.WHITE, star, 2)
+            for orb in self.flashing_orbs:
+                alpha = (math.sin(pygame.time.get_ticks() / 1000) + 1) / 2
+                color = (int(self.YELLOW[0] * alpha), int(self.YELLOW[1] * alpha), int(self.YELLOW[2] * alpha))
+                pygame.draw.circle(self.screen, color, (orb[0], orb[1]), orb[2])
 
         title = self.font.render("Wizard Pinball", True, self.YELLOW)
-        self.screen.blit(title, title.get_rect(center=(self.WIDTH // 2, 80)))
-        self.screen.blit(self.logo, (self.WIDTH // 2 - 150, self.HEIGHT // 2))
+        self.screen.blit(title, title.get_rect(center=(self.WIDTH // 2, self.px(80))))
+        self.screen.blit(self.logo, self.logo_center_pos)
 
         if pygame.time.get_ticks() % 1000 < 500:
             press_start_text = self.press_start_font.render("PRESS START", True, self.WHITE)
-            self.screen.blit(press_start_text, press_start_text.get_rect(center=(self.WIDTH // 2, self.HEIGHT // 2 - 50)))
-
-        pygame.display.flip()
+            self.screen.blit(press_start_text, press_start_text.get_rect(center=(self.WIDTH // 2, self.HEIGHT // 2 - self.px(50))))
 
     def draw_launch(self, ball: int = 0):
         self.screen.fill(self.BLACK)
         launch_text = self.font.render(f"Ball: {ball}", True, self.YELLOW)
         self.screen.blit(launch_text, launch_text.get_rect(center=(self.WIDTH // 2, self.HEIGHT // 2)))
-        self.screen.blit(self.logo, (self.WIDTH // 2 - 150, self.HEIGHT - 400))
-        pygame.display.flip()
+        self.screen.blit(self.logo, self.logo_bottom_pos)
 
     def draw_play(self, score):
         self.screen.fill(self.BLACK)
         play_text = self.font.render("PLAYING", True, self.YELLOW)
         score_text = self.font.render(f"Score: {score}", True, self.WHITE)
-        self.screen.blit(play_text, play_text.get_rect(center=(self.WIDTH // 2, 150)))
+        self.screen.blit(play_text, play_text.get_rect(center=(self.WIDTH // 2, self.px(150))))
         self.screen.blit(score_text, score_text.get_rect(center=(self.WIDTH // 2, self.HEIGHT // 2)))
-        self.screen.blit(self.logo, (self.WIDTH // 2 - 150, self.HEIGHT - 400))
-        pygame.display.flip()
+        self.screen.blit(self.logo, self.logo_bottom_pos)
 
     def draw_game_over(self, score):
         self.screen.fill(self.BLACK)
         over_text = self.font.render("GAME OVER", True, self.RED)
         score_text = self.font.render(f"Final Score: {score}", True, self.WHITE)
-        self.screen.blit(over_text, over_text.get_rect(center=(self.WIDTH // 2, 150)))
+        self.screen.blit(over_text, over_text.get_rect(center=(self.WIDTH // 2, self.px(150))))
         self.screen.blit(score_text, score_text.get_rect(center=(self.WIDTH // 2, self.HEIGHT // 2)))
-        self.screen.blit(self.logo, (self.WIDTH // 2 - 150, self.HEIGHT - 400))
-        pygame.display.flip()
+        self.screen.blit(self.logo, self.logo_bottom_pos)
 
     def draw_high_scores(self):
         self.screen.fill(self.BLACK)
         stats_text = self.stats_font.render("High Scores", True, self.WHITE)
-        self.screen.blit(stats_text, stats_text.get_rect(center=(self.WIDTH // 2, 150)))
-        for i, (name, score) in enumerate(self.high_scores):
+        self.screen.blit(stats_text, stats_text.get_rect(center=(self.WIDTH // 2, self.px(150))))
+        high_scores = self.high_scores
+        if self.high_score_store is not None:
+            high_scores = self.high_score_store.top()[:5] or self.high_scores
+        for i, (name, score) in enumerate(high_scores):
             entry = self.stats_font.render(f"{i+1}. {name} - {score}", True, self.WHITE)
-            self.screen.blit(entry, (self.WIDTH // 2 - 150, 250 + i * 80))
-        self.screen.blit(self.logo, (self.WIDTH // 2 - 150, self.HEIGHT - 400))
+            self.screen.blit(entry, (self.WIDTH // 2 - self.px(150), self.px(250 + i * 80)))
+        self.screen.blit(self.logo, self.logo_bottom_pos)
 
         if pygame.time.get_ticks() % 1000 < 500:
             press_start_text = self.press_start_font.render("PRESS START", True, self.WHITE)
-            self.screen.blit(press_start_text, press_start_text.get_rect(center=(self.WIDTH // 2, self.HEIGHT // 2 - 50)))
-
-        pygame.display.flip()
+            self.screen.blit(press_start_text, press_start_text.get_rect(center=(self.WIDTH // 2, self.HEIGHT // 2 - self.px(50))))
 
 if __name__ == "__main__":
     import time
@@ -141,4 +193,5 @@ if __name__ == "__main__":
         screen_api.update(demo_states[current], score if demo_states[current] == "play" or demo_states[current] == "game_over" else 0)
         pygame.time.Clock().tick(30)
 
+    screen_api.stop()
     pygame.quit()
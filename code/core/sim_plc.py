@@ -0,0 +1,272 @@
+"""
+Simulated PLC
+=============
+
+This module defines the SimulatedPLC class, an in-memory Modbus
+transport for ModbusAPI. It keeps coils, input registers and holding
+registers in plain lists and runs a small model of the ladder logic
+in PLC_code/Pinball_PLC_rev1.txt, so the game, benchmarks and bench
+tests run without a PLC or a Modbus server.
+
+Modeled from the ladder program (Modbus addresses are zero-based):
+  - Passive/Game stages: the start button moves to the game stage,
+    sets game_on (MC5) and resets every counter; game_over (MC2)
+    halts play and returns to the passive stage.
+  - Score counters CT0-CT7 mirrored to input registers MIR1-MIR8,
+    counted only while a game is running.
+  - Pulse coils (drop reset MC1, load ball MC3, auto kicker MC4) are
+    cleared by the PLC on the next scan after the Pi sets them.
+  - extra_ball (MC10) rising edge decrements the ball drain counter.
+  - shooter lane switch X12 mirrored to MC11.
+  - optionally, the event FIFO of core/event_fifo.py: every input
+    change is logged to a ring in the holding registers.
+
+Optional latency, jitter and fault injection make it usable for
+exercising the connection manager.
+
+Author: Wizard Pinball contributors
+Project: University of Idaho PLC Pinball
+Last Updated: 10/19/2026
+"""
+
+import random
+import threading
+import time
+from typing import Callable, List, Optional
+
+from core.event_fifo import HEAD, TAIL, DROPPED, CLOCK_LO, CLOCK_HI, HEADER_WORDS, RECORD_WORDS, source_code
+
+# coil addresses (zero-based Modbus offsets of MC1..MC11)
+DROP_RESET_COIL = 0
+GAME_OVER_COIL = 1
+LOAD_BALL_COIL = 2
+AUTO_KICK_COIL = 3
+GAME_ON_COIL = 4
+EXTRA_BALL_COIL = 9
+SHOOTER_COIL = 10
+
+PULSE_COILS = (DROP_RESET_COIL, LOAD_BALL_COIL, AUTO_KICK_COIL)
+
+# input register address of each counter (MIR1..MIR8)
+COUNTER_REGISTERS = {
+    "slingshot": 0,
+    "drop_target": 1,
+    "lane_1": 2,
+    "lane_2": 3,
+    "lane_3": 4,
+    "lane_4": 5,
+    "ball_drain": 6,
+    "pop_bumper": 7,
+}
+
+COUNTER_MAX = 32000
+
+
+class SimulatedPLC:
+    """
+    In-memory stand-in for pyModbusTCP's ModbusClient.
+    :param latency: Seconds added to every request.
+    :param jitter: Extra random delay of up to this many seconds per request.
+    :param fault_rate: Probability that a request fails and drops the connection.
+    :param seed: Seed for the jitter and fault random generator.
+    :param fifo_address: First holding register of the event FIFO block
+                         (devices.json numbering); None disables the FIFO.
+    :param fifo_capacity: Record slots in the event FIFO.
+    :param clock: Returns the PLC's time in seconds; tests pass a fake to step
+                  the FIFO's millisecond clock by hand.
+    """
+    def __init__(self,
+                 num_coils: int = 16,
+                 num_registers: int = 16,
+                 latency: float = 0.0,
+                 jitter: float = 0.0,
+                 fault_rate: float = 0.0,
+                 seed: Optional[int] = None,
+                 fifo_address: Optional[int] = None,
+                 fifo_capacity: int = 30,
+                 clock: Callable[[], float] = time.monotonic):
+        self.coils: List[bool] = [False] * num_coils
+        self.input_registers: List[int] = [0] * num_registers
+        self.fifo_base = None if fifo_address is None else fifo_address - 1
+        self.fifo_capacity = fifo_capacity
+        if self.fifo_base is not None:
+            num_holding = max(num_registers, self.fifo_base + HEADER_WORDS + fifo_capacity * RECORD_WORDS)
+        else:
+            num_holding = num_registers
+        self.holding_registers: List[int] = [0] * num_holding
+        self.clock = clock
+        self.start_time = clock()
+        self.latency = latency
+        self.jitter = jitter
+        self.fault_rate = fault_rate
+        self.random = random.Random(seed)
+        self.lock = threading.RLock()
+
+        self.is_open = False
+        self.reachable = True
+        self.last_error_as_txt = "no error"
+
+        self.game_running = False
+        self.balls_loaded = 0
+        self.last_extra_ball = False
+
+    # ---- ModbusClient interface ----
+
+    def open(self) -> bool:
+        self._delay()
+        self.is_open = self.reachable
+        if not self.is_open:
+            self.last_error_as_txt = "connect error"
+        return self.is_open
+
+    def close(self):
+        self.is_open = False
+
+    def read_coils(self, address: int, count: int = 1):
+        return self._request(lambda: list(self.coils[address:address + count]), address, count, self.coils)
+
+    def read_input_registers(self, address: int, count: int = 1):
+        return self._request(lambda: list(self.input_registers[address:address + count]),
+                             address, count, self.input_registers)
+
+    def read_holding_registers(self, address: int, count: int = 1):
+        return self._request(lambda: list(self.holding_registers[address:address + count]),
+                             address, count, self.holding_registers)
+
+    def write_single_coil(self, address: int, value) -> Optional[bool]:
+        def write():
+            self.coils[address] = bool(value)
+            return True
+        return self._request(write, address, 1, self.coils)
+
+    def write_single_register(self, address: int, value: int) -> Optional[bool]:
+        def write():
+            self.holding_registers[address] = int(value) & 0xFFFF
+            return True
+        return self._request(write, address, 1, self.holding_registers)
+
+    def write_multiple_registers(self, address: int, values: List[int]) -> Optional[bool]:
+        def write():
+            self.holding_registers[address:address + len(values)] = [int(v) & 0xFFFF for v in values]
+            return True
+        return self._request(write, address, len(values), self.holding_registers)
+
+    def _request(self, operation, address: int, count: int, table: list):
+        self._delay()
+        with self.lock:
+            if not self.is_open:
+                self.last_error_as_txt = "socket closed"
+                return None
+            if self.fault_rate and self.random.random() < self.fault_rate:
+                self.is_open = False
+                self.last_error_as_txt = "injected fault"
+                return None
+            if address < 0 or address + count > len(table):
+                self.last_error_as_txt = "illegal data address"
+                return None
+            self.scan()
+            return operation()
+
+    def _delay(self):
+        delay = self.latency
+        if self.jitter:
+            delay += self.random.uniform(0, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+    # ---- ladder logic ----
+
+    def scan(self):
+        """Run one PLC scan: handle the Pi's coil writes."""
+        with self.lock:
+            if self.fifo_base is not None:
+                clock = self._clock()
+                self.holding_registers[self.fifo_base + CLOCK_LO] = clock & 0xFFFF
+                self.holding_registers[self.fifo_base + CLOCK_HI] = clock >> 16
+
+            if self.coils[GAME_OVER_COIL]:
+                self.coils[GAME_OVER_COIL] = False
+                self.game_running = False
+            self._set_input_coil(GAME_ON_COIL, self.game_running)
+
+            if self.coils[LOAD_BALL_COIL]:
+                self.balls_loaded += 1
+            for coil in PULSE_COILS:
+                self.coils[coil] = False
+
+            extra_ball = self.coils[EXTRA_BALL_COIL]
+            if extra_ball and not self.last_extra_ball:
+                register = COUNTER_REGISTERS["ball_drain"]
+                self._set_counter(register, max(0, self.input_registers[register] - 1))
+            self.last_extra_ball = extra_ball
+
+    def _set_input_coil(self, coil: int, value: bool):
+        if self.coils[coil] != value:
+            self.coils[coil] = value
+            self._log_event(source_code("coil", coil + 1), int(value))
+
+    def _set_counter(self, register: int, value: int):
+        if self.input_registers[register] != value:
+            self.input_registers[register] = value
+            self._log_event(source_code("input_register", register + 1), value)
+
+    def _clock(self) -> int:
+        return int((self.clock() - self.start_time) * 1000) & 0xFFFFFFFF
+
+    def _log_event(self, source: int, value: int):
+        """Append a record to the event FIFO, or count it as dropped if the ring is full."""
+        if self.fifo_base is None:
+            return
+        registers = self.holding_registers
+        base = self.fifo_base
+        head = registers[base + HEAD]
+        next_head = (head + 1) % self.fifo_capacity
+        if next_head == registers[base + TAIL] % self.fifo_capacity:
+            registers[base + DROPPED] = (registers[base + DROPPED] + 1) & 0xFFFF
+            return
+        clock = self._clock()
+        offset = base + HEADER_WORDS + head * RECORD_WORDS
+        registers[offset:offset + RECORD_WORDS] = [source, value & 0xFFFF, clock & 0xFFFF, clock >> 16]
+        registers[base + HEAD] = next_head
+
+    # ---- scripting (physical inputs) ----
+
+    def press_start(self):
+        """Start button X11: enter the game stage and reset all counters."""
+        with self.lock:
+            for register in COUNTER_REGISTERS.values():
+                self._set_counter(register, 0)
+            self.game_running = True
+            self.scan()
+
+    def flipper_reset(self):
+        """Both flippers held for 5 s: the PLC leaves the game stage."""
+        with self.lock:
+            self.game_running = False
+            self.scan()
+
+    def hit(self, switch: str, times: int = 1):
+        """Count times hits on a scoring switch (see COUNTER_REGISTERS)."""
+        register = COUNTER_REGISTERS[switch]
+        with self.lock:
+            if self.game_running:
+                # the PLC logs every count, so a burst gives one record per hit
+                for _ in range(times):
+                    self._set_counter(register, min(self.input_registers[register] + 1, COUNTER_MAX))
+
+    def set_shooter_lane(self, occupied: bool):
+        """Shooter lane switch X12, mirrored to MC11."""
+        with self.lock:
+            self._set_input_coil(SHOOTER_COIL, occupied)
+
+    # ---- fault injection ----
+
+    def disconnect(self):
+        """Simulate a cable fault: drop the connection and refuse reconnects."""
+        with self.lock:
+            self.reachable = False
+            self.is_open = False
+
+    def reconnect(self):
+        with self.lock:
+            self.reachable = True
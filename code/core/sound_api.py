@@ -4,16 +4,37 @@ import os
 from typing import Dict
 
 class SoundAPI:
-    def __init__(self, sound_dir="assets/sounds"):
+    def __init__(self, sound_dir="assets/sounds", bundle=None):
+        """
+        :param sound_dir: Directory of the loose sound files.
+        :param bundle: Optional AssetBundle; sounds found in it under "sounds/" are
+                       loaded from the mapped bundle instead of sound_dir.
+        """
         pygame.mixer.init()
         pygame.mixer.init()
         print(f"[DEBUG] Mixer initialized: {pygame.mixer.get_init()}")
 
         self.sounds: Dict[str, pygame.mixer.Sound] = {}
         self.sound_dir: str = sound_dir
+        self.bundle = bundle
+        # pygame streams music from this file object; it must stay alive while playing
+        self.music_file = None
         # self.sound_dir: str = os.abspath(os.join(os.path.dirname(__file__), "..", sound_dir))
 
+    def _bundle_name(self, filename):
+        name = f"sounds/{filename}"
+        if self.bundle is not None and name in self.bundle:
+            return name
+        return None
+
     def load_sound(self, name, filename):
+        bundle_name = self._bundle_name(filename)
+        if bundle_name:
+            try:
+                self.sounds[name] = self.bundle.sound(bundle_name)
+                return
+            except (ValueError, pygame.error) as e:
+                print(f"[SoundManager] Bundle copy of {filename} unusable, loading file: {e}")
         path = os.path.join(self.sound_dir, filename)
         if os.path.exists(path):
             self.sounds[name] = pygame.mixer.Sound(path)
@@ -39,6 +60,17 @@ class SoundAPI:
     def set_background_music(self, filename: str, volume: float = 1.0):
         if pygame.mixer.music.get_busy():
             pygame.mixer.music.stop()
+        bundle_name = self._bundle_name(filename)
+        if bundle_name and self.bundle.entry(bundle_name)["kind"] == "file":
+            try:
+                self.music_file = self.bundle.file_object(bundle_name)
+                pygame.mixer.music.load(self.music_file, filename)
+                pygame.mixer.music.set_volume(volume)
+                pygame.mixer.music.play(-1)
+            except Exception as e:
+                print(f"[ERROR] Failed to play background music: {e}")
+            print(f"[DEBUG] Game music playback started.")
+            return
         path = os.path.join(self.sound_dir, filename)
         if os.path.exists(path):
             try:
@@ -0,0 +1,127 @@
+"""
+State Machine
+=============
+
+This module defines a small table-driven state machine.
+States and events are integer IDs, transitions are looked up
+in a per-state table, and states may declare entry/exit actions
+and a timeout that fires an event through a TimerWheel.
+
+Author: Wizard Pinball contributors
+Project: University of Idaho PLC Pinball
+Last Updated: 10/19/2026
+"""
+
+from typing import Callable, Dict, List, Optional
+
+from core.timer_wheel import TimerWheel, Timer
+
+
+class StateDef:
+    """
+    Declaration of a single state.
+    :param state_id: Integer ID of the state.
+    :param on_enter: Called after the machine enters this state.
+    :param on_exit: Called before the machine leaves this state.
+    :param timeout_ms: If set, timeout_event is dispatched after the machine
+                       has stayed in this state for timeout_ms.
+    :param timeout_event: Event ID dispatched when the timeout expires.
+    """
+    def __init__(self,
+                 state_id: int,
+                 on_enter: Optional[Callable[[], None]] = None,
+                 on_exit: Optional[Callable[[], None]] = None,
+                 timeout_ms: Optional[int] = None,
+                 timeout_event: Optional[int] = None):
+        self.state_id = state_id
+        self.on_enter = on_enter
+        self.on_exit = on_exit
+        self.timeout_ms = timeout_ms
+        self.timeout_event = timeout_event
+
+
+class Transition:
+    """
+    Row of the transition table.
+    :param target: State ID to move to, or None for an internal
+                   transition that only runs the action.
+    :param action: Called between the exit and entry actions.
+    """
+    __slots__ = ("target", "action")
+
+    def __init__(self, target: Optional[int], action: Optional[Callable[[], None]] = None):
+        self.target = target
+        self.action = action
+
+
+class StateMachine:
+    """
+    Dispatches integer events against a table of
+    {state_id: {event_id: Transition}}. Events with no entry for the
+    current state are ignored. Dispatch is a pair of dict lookups.
+    """
+    def __init__(self,
+                 states: List[StateDef],
+                 transitions: Dict[int, Dict[int, Transition]],
+                 initial: int,
+                 timer_wheel: Optional[TimerWheel] = None):
+        self.states: Dict[int, StateDef] = {s.state_id: s for s in states}
+        self.transitions = transitions
+        self.timer_wheel = timer_wheel if timer_wheel is not None else TimerWheel()
+        self.state = initial
+        self.previous_state = initial
+        self._timeout: Optional[Timer] = None
+        self._started = False
+        # observer called as on_transition(old_state, new_state) before the exit action
+        self.on_transition: Optional[Callable[[int, int], None]] = None
+
+    def start(self):
+        """Enter the initial state (runs its entry action and timeout)."""
+        if not self._started:
+            self._started = True
+            self._enter(self.state)
+
+    def dispatch(self, event_id: int) -> bool:
+        """
+        Run the transition for event_id in the current state.
+        Returns True if the event was handled.
+        """
+        transition = self.transitions.get(self.state, {}).get(event_id)
+        if transition is None:
+            return False
+
+        if transition.target is None:
+            if transition.action:
+                transition.action()
+            return True
+
+        if self.on_transition:
+            self.on_transition(self.state, transition.target)
+        self._exit(self.state)
+        if transition.action:
+            transition.action()
+        self.previous_state = self.state
+        self.state = transition.target
+        self._enter(self.state)
+        return True
+
+    def update(self, delta_time: int):
+        """Advance timed transitions by delta_time milliseconds."""
+        self.timer_wheel.advance(delta_time)
+
+    def _enter(self, state_id: int):
+        state = self.states[state_id]
+        if state.timeout_ms is not None and state.timeout_event is not None:
+            event_id = state.timeout_event
+            self._timeout = self.timer_wheel.schedule(
+                state.timeout_ms, lambda: self.dispatch(event_id))
+        if state.on_enter:
+            state.on_enter()
+
+    def _exit(self, state_id: int):
+        if self._timeout is not None:
+            self._timeout.cancel()
+            self._timeout = None
+        state = self.states[state_id]
+        if state.on_exit:
+            state.on_exit()
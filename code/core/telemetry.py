@@ -0,0 +1,294 @@
+"""
+Telemetry
+=========
+
+This module records per-game telemetry (device hits, state
+transitions, ball and game durations) into fixed-size column
+buffers and flushes them to compact columnar files on a
+background thread. It also keeps rolling aggregates that can be
+queried cheaply while the machine is running.
+
+File format (.wzt, little endian):
+    magic b"WZTL", uint16 version, uint32 meta length, meta JSON
+    then any number of chunks, each:
+        uint16 table name length, table name
+        uint32 rows, uint16 columns
+        per column: uint16 name length, name, 1 byte array typecode,
+                    uint32 byte length, raw column data
+
+Hits are written by the EventAPI thread through subscribe(), so
+recording them costs nothing on the game thread.
+
+Author: Wizard Pinball contributors
+Project: University of Idaho PLC Pinball
+Last Updated: 10/19/2026
+"""
+
+import json
+import os
+import queue
+import struct
+import threading
+import time
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+from core.event_api import COUNT
+
+MAGIC = b"WZTL"
+VERSION = 1
+
+# table name -> [(column name, array typecode)]
+TABLES = {
+    "hits": [("t", "d"), ("device", "H"), ("count", "H")],
+    "transitions": [("t", "d"), ("from", "B"), ("to", "B")],
+    "balls": [("t", "d"), ("ball", "B"), ("duration_ms", "I")],
+    "games": [("t", "d"), ("duration_ms", "I"), ("score", "I")],
+}
+
+MINUTES_KEPT = 60
+
+
+class ColumnBuffer:
+    """Preallocated columns for one table; append() writes in place."""
+    def __init__(self, columns: List[Tuple[str, str]], capacity: int):
+        self.columns = columns
+        self.capacity = capacity
+        self.data = [array(typecode, [0]) * capacity for _, typecode in columns]
+        self.size = 0
+
+    def append(self, *values) -> bool:
+        """Store one row. Returns True when the buffer is full."""
+        i = self.size
+        for column, value in zip(self.data, values):
+            column[i] = value
+        self.size = i + 1
+        return self.size >= self.capacity
+
+    def take(self) -> List[array]:
+        """Copy out the filled rows and reset the buffer."""
+        rows = [column[:self.size] for column in self.data]
+        self.size = 0
+        return rows
+
+
+class Telemetry:
+    """
+    Buffers telemetry rows per table and writes them out per game or per hour.
+    :param out_dir: Directory for .wzt files.
+    :param device_names: Device names in the order used for device IDs.
+    :param state_names: State names in the order used for state IDs.
+    :param rotate: "game" for one file per game, "hour" for one file per hour.
+    :param capacity: Rows per column buffer before it is flushed.
+    """
+    def __init__(self, out_dir: str, device_names: List[str], state_names: List[str],
+                 rotate: str = "game", capacity: int = 4096):
+        if rotate not in ("game", "hour"):
+            raise ValueError(f"Unknown telemetry rotation '{rotate}'")
+        self.out_dir = out_dir
+        self.device_names = list(device_names)
+        self.device_ids = {name: i for i, name in enumerate(self.device_names)}
+        self.state_names = list(state_names)
+        self.rotate = rotate
+        self.lock = threading.Lock()
+        self.buffers = {name: ColumnBuffer(columns, capacity) for name, columns in TABLES.items()}
+        self.game_path: Optional[str] = None
+        self.game_start = 0.0
+
+        # rolling aggregates
+        num_devices = len(self.device_names)
+        self.total_hits = array("I", [0]) * num_devices
+        self.minute_hits = [array("I", [0]) * num_devices for _ in range(MINUTES_KEPT)]
+        self.minute_stamp = [-1] * MINUTES_KEPT
+        self.games_played = 0
+        self.total_game_ms = 0
+
+        os.makedirs(out_dir, exist_ok=True)
+        self.queue: "queue.Queue[Optional[Tuple[str, str, List[array]]]]" = queue.Queue()
+        self.running = True
+        self.thread = threading.Thread(target=self._writer_loop, daemon=True)
+        self.thread.start()
+
+    # ---- recording ----
+
+    def record_hit(self, event):
+        """
+        EventAPI subscriber for COUNT and RISING events.
+        COUNT events carry the batched number of hits in event.delta.
+        """
+        device_id = self.device_ids.get(event.device)
+        if device_id is None:
+            return
+        count = event.delta if event.kind == COUNT else 1
+        minute = int(event.timestamp // 60)
+        slot = minute % MINUTES_KEPT
+        with self.lock:
+            if self.minute_stamp[slot] != minute:
+                self.minute_hits[slot] = array("I", [0]) * len(self.device_names)
+                self.minute_stamp[slot] = minute
+            self.minute_hits[slot][device_id] += count
+            self.total_hits[device_id] += count
+            self._append("hits", event.timestamp, device_id, min(count, 0xFFFF))
+
+    def record_transition(self, old_state: int, new_state: int):
+        with self.lock:
+            self._append("transitions", time.time(), int(old_state), int(new_state))
+
+    def record_ball(self, ball: int, duration_ms: int):
+        with self.lock:
+            self._append("balls", time.time(), ball, max(0, int(duration_ms)))
+
+    def start_game(self):
+        now = time.time()
+        with self.lock:
+            self.game_start = now
+            if self.rotate == "game":
+                # rows from attract mode, including this transition, go to the hourly file
+                for name in self.buffers:
+                    self._flush(name)
+                stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(now))
+                self.game_path = os.path.join(self.out_dir, f"game-{stamp}.wzt")
+
+    def end_game(self, score: int):
+        """Record the finished game and flush every buffer to its file."""
+        now = time.time()
+        duration_ms = int((now - self.game_start) * 1000) if self.game_start else 0
+        with self.lock:
+            self._append("games", self.game_start or now, duration_ms, max(0, score))
+            self.games_played += 1
+            self.total_game_ms += duration_ms
+            for name in self.buffers:
+                self._flush(name)
+            self.game_path = None
+            self.game_start = 0.0
+
+    def _append(self, table: str, *values):
+        if self.buffers[table].append(*values):
+            self._flush(table)
+
+    def _flush(self, table: str):
+        buffer = self.buffers[table]
+        if buffer.size:
+            self.queue.put_nowait((self._current_path(), table, buffer.take()))
+
+    def _current_path(self) -> str:
+        if self.game_path is not None:
+            return self.game_path
+        stamp = time.strftime("%Y%m%d-%H", time.localtime())
+        return os.path.join(self.out_dir, f"telemetry-{stamp}.wzt")
+
+    # ---- aggregates ----
+
+    def hits_per_minute(self, device: str, window: int = 10) -> float:
+        """Average hits per minute for a device over the last window minutes."""
+        device_id = self.device_ids.get(device)
+        if device_id is None:
+            return 0.0
+        window = max(1, min(window, MINUTES_KEPT))
+        now_minute = int(time.time() // 60)
+        with self.lock:
+            hits = sum(self.minute_hits[slot][device_id]
+                       for slot in range(MINUTES_KEPT)
+                       if now_minute - window < self.minute_stamp[slot] <= now_minute)
+        return hits / window
+
+    def total_hits_by_device(self) -> Dict[str, int]:
+        with self.lock:
+            return dict(zip(self.device_names, self.total_hits))
+
+    def average_game_length(self) -> float:
+        """Average game length in seconds since startup."""
+        with self.lock:
+            if not self.games_played:
+                return 0.0
+            return self.total_game_ms / self.games_played / 1000
+
+    # ---- file output ----
+
+    def _writer_loop(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            path, table, columns = item
+            try:
+                self._write_chunk(path, table, columns)
+            except OSError as e:
+                print(f"[Telemetry] Failed to write {path}: {e}")
+
+    def _write_chunk(self, path: str, table: str, columns: List[array]):
+        with open(path, "ab") as f:
+            if f.tell() == 0:
+                meta = json.dumps({"devices": self.device_names,
+                                   "states": self.state_names}).encode()
+                f.write(MAGIC + struct.pack("<HI", VERSION, len(meta)) + meta)
+            name = table.encode()
+            f.write(struct.pack("<H", len(name)) + name)
+            f.write(struct.pack("<IH", len(columns[0]), len(columns)))
+            for (column_name, typecode), data in zip(TABLES[table], columns):
+                encoded = column_name.encode()
+                raw = data.tobytes()
+                f.write(struct.pack("<H", len(encoded)) + encoded)
+                f.write(typecode.encode() + struct.pack("<I", len(raw)) + raw)
+
+    def stop(self):
+        """Flush partially filled buffers and stop the writer thread."""
+        if not self.running:
+            return
+        self.running = False
+        with self.lock:
+            for name in self.buffers:
+                self._flush(name)
+        self.queue.put(None)
+        self.thread.join()
+
+
+def read_telemetry(path: str):
+    """
+    Load a .wzt file. Returns (meta, tables) where tables maps
+    table name -> column name -> array with all chunks concatenated.
+    """
+    tables: Dict[str, Dict[str, array]] = {}
+    with open(path, "rb") as f:
+        if f.read(4) != MAGIC:
+            raise ValueError(f"Not a telemetry file: {path}")
+        _version, meta_len = struct.unpack("<HI", f.read(6))
+        meta = json.loads(f.read(meta_len))
+        while True:
+            try:
+                chunk = _read_chunk(f)
+            except (struct.error, ValueError):
+                break  # chunk cut short by a power loss
+            if chunk is None:
+                break
+            name, columns = chunk
+            table = tables.setdefault(name, {})
+            for column_name, data in columns:
+                table.setdefault(column_name, array(data.typecode)).extend(data)
+    return meta, tables
+
+
+def _read_exact(f, size: int) -> bytes:
+    data = f.read(size)
+    if len(data) != size:
+        raise ValueError("truncated chunk")
+    return data
+
+
+def _read_chunk(f):
+    header = f.read(2)
+    if not header:
+        return None
+    if len(header) < 2:
+        raise ValueError("truncated chunk")
+    name = _read_exact(f, struct.unpack("<H", header)[0]).decode()
+    rows, num_columns = struct.unpack("<IH", _read_exact(f, 6))
+    columns = []
+    for _ in range(num_columns):
+        column_name = _read_exact(f, struct.unpack("<H", _read_exact(f, 2))[0]).decode()
+        data = array(_read_exact(f, 1).decode())
+        data.frombytes(_read_exact(f, struct.unpack("<I", _read_exact(f, 4))[0]))
+        if len(data) != rows:
+            raise ValueError("truncated column")
+        columns.append((column_name, data))
+    return name, columns
@@ -0,0 +1,88 @@
+"""
+Timer Wheel
+===========
+
+This module defines a hashed timer wheel used to schedule
+delayed callbacks (timed state transitions, cooldowns, etc.)
+without sleeping. The wheel does not own a thread; it is
+driven by calling advance() with the elapsed frame time.
+
+Author: Wizard Pinball contributors
+Project: University of Idaho PLC Pinball
+Last Updated: 10/19/2026
+"""
+
+from typing import Callable, List
+
+
+class Timer:
+    """
+    Handle for a scheduled callback. Returned by TimerWheel.schedule()
+    so the caller can cancel it later.
+    """
+    __slots__ = ("rounds", "callback", "cancelled")
+
+    def __init__(self, rounds: int, callback: Callable[[], None]):
+        self.rounds = rounds
+        self.callback = callback
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class TimerWheel:
+    """
+    Fixed-size ring of slots, each holding the timers that expire when
+    the wheel's cursor reaches it. Scheduling and cancelling are O(1);
+    advancing costs one slot visit per elapsed tick.
+    """
+    def __init__(self, tick_ms: int = 50, num_slots: int = 64):
+        """
+        :param tick_ms: Resolution of the wheel in milliseconds.
+        :param num_slots: Number of slots. Delays longer than
+                          tick_ms * num_slots wrap around the wheel.
+        """
+        self.tick_ms = tick_ms
+        self.num_slots = num_slots
+        self.slots: List[List[Timer]] = [[] for _ in range(num_slots)]
+        self.cursor = 0
+        self.elapsed_ms = 0
+
+    def schedule(self, delay_ms: int, callback: Callable[[], None]) -> Timer:
+        """
+        Run callback once after delay_ms has been advanced through the wheel.
+        The delay is rounded up to the next tick.
+        """
+        ticks = max(1, -(-int(delay_ms) // self.tick_ms))
+        rounds, offset = divmod(ticks - 1, self.num_slots)
+        timer = Timer(rounds, callback)
+        self.slots[(self.cursor + 1 + offset) % self.num_slots].append(timer)
+        return timer
+
+    def advance(self, delta_ms: int):
+        """Move the wheel forward by delta_ms and fire every timer that expired."""
+        self.elapsed_ms += delta_ms
+        while self.elapsed_ms >= self.tick_ms:
+            self.elapsed_ms -= self.tick_ms
+            self.cursor = (self.cursor + 1) % self.num_slots
+            self._expire(self.cursor)
+
+    def _expire(self, index: int):
+        slot = self.slots[index]
+        if not slot:
+            return
+        # swap the slot out so callbacks can schedule into it safely
+        self.slots[index] = []
+        for timer in slot:
+            if timer.cancelled:
+                continue
+            if timer.rounds > 0:
+                timer.rounds -= 1
+                self.slots[index].append(timer)
+            else:
+                timer.callback()
+
+    def clear(self):
+        for slot in self.slots:
+            slot.clear()
@@ -0,0 +1,150 @@
+"""
+Attract Video Layer
+===================
+
+This module defines the VideoLayer class, which plays a looping promo
+video behind the attract screen.
+
+Frames are decoded on a background thread (OpenCV releases the GIL
+while decoding and scaling) into a fixed ring of surfaces allocated
+up front, so memory stays at ring_size frames no matter how long the
+video is. The render loop only takes the newest frame that is due and
+blits it; it never waits for the decoder. When the decoder falls
+behind, the last frame is held instead of skipping ahead, and the
+decoder sleeps whenever the ring is full or the layer is inactive.
+
+OpenCV is an optional dependency and is not in requirements.txt; the
+attract screen runs without the video when it is missing. To enable it:
+
+    pip install opencv-python-headless==4.10.0.84
+
+Author: Wizard Pinball contributors
+Project: University of Idaho PLC Pinball
+Last Updated: 10/19/2026
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from typing import Optional, Tuple
+
+import pygame
+
+try:
+    import cv2
+    import numpy as np
+    import pygame.surfarray
+except ImportError:  # opencv-python-headless provides the decoder
+    cv2 = None
+
+# longest gap between two frame() calls counted as playback time, so the
+# video resumes where it left off after the screen showed something else
+MAX_STEP = 0.05
+
+
+class VideoLayer:
+    """
+    Decodes a video file in a loop into a ring of preallocated surfaces.
+    :param path: Video file readable by OpenCV (mp4/H.264 on the Pi).
+    :param size: Size the frames are scaled to, normally the screen size.
+    :param ring_size: Number of decoded frames kept; bounds memory use.
+    """
+    def __init__(self, path: str, size: Tuple[int, int], ring_size: int = 4):
+        if cv2 is None:
+            raise ImportError("VideoLayer requires opencv-python-headless")
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Video file not found: {path}")
+        self.capture = cv2.VideoCapture(path)
+        if not self.capture.isOpened():
+            raise ValueError(f"Cannot decode video: {path}")
+        self.path = path
+        self.size = size
+        self.fps = self.capture.get(cv2.CAP_PROP_FPS) or 30.0
+
+        self.slots = [pygame.Surface(size) for _ in range(ring_size)]
+        self.free = deque(range(ring_size))   # slots the decoder may fill
+        self.ready = deque()                  # (slot, presentation time) in decode order
+        self.current: Optional[int] = None    # slot on screen; never handed to the decoder
+        self.current_time = 0.0
+        self.position = 0.0                   # playback clock in video seconds
+        self.last_call: Optional[float] = None
+        self.cond = threading.Condition()
+
+        self.active = False
+        self.running = True
+        self.thread = threading.Thread(target=self._decode_loop, name="video-decoder", daemon=True)
+        self.thread.start()
+
+    def set_active(self, active: bool):
+        """Start or pause decoding; the ring keeps its frames while paused."""
+        with self.cond:
+            if active != self.active:
+                self.active = active
+                self.last_call = None
+                self.cond.notify()
+
+    def frame(self) -> Optional[pygame.Surface]:
+        """
+        Advance the playback clock and return the surface of the newest due
+        frame, or None before the first frame is decoded. Call once per
+        rendered frame from the main thread.
+        """
+        now = time.monotonic()
+        with self.cond:
+            if self.last_call is not None:
+                self.position += min(now - self.last_call, MAX_STEP)
+            self.last_call = now
+
+            released = False
+            while self.ready and (self.current is None or self.ready[0][1] <= self.position):
+                slot, self.current_time = self.ready.popleft()
+                if self.current is not None:
+                    self.free.append(self.current)
+                    released = True
+                self.current = slot
+            if not self.ready:
+                # decoder behind: hold the last frame rather than skip frames later
+                self.position = min(self.position, self.current_time + 1 / self.fps)
+            if released:
+                self.cond.notify()
+        return None if self.current is None else self.slots[self.current]
+
+    def _decode_loop(self):
+        width, height = self.size
+        decoded = None
+        scaled = np.empty((height, width, 3), np.uint8)
+        frame_index = 0  # keeps counting across loops so presentation times only increase
+        while True:
+            with self.cond:
+                while self.running and not (self.active and self.free):
+                    self.cond.wait()
+                if not self.running:
+                    return
+                slot = self.free.popleft()
+
+            ok, decoded = self.capture.read(decoded)
+            if not ok:
+                # end of file: loop
+                self.capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                ok, decoded = self.capture.read(decoded)
+            if not ok:
+                print(f"[VideoLayer] Decoding {self.path} failed, stopping video")
+                with self.cond:
+                    self.free.append(slot)
+                return
+
+            cv2.resize(decoded, self.size, dst=scaled, interpolation=cv2.INTER_AREA)
+            cv2.cvtColor(scaled, cv2.COLOR_BGR2RGB, dst=scaled)
+            # surfarray arrays are indexed [x, y]
+            pygame.surfarray.blit_array(self.slots[slot], scaled.swapaxes(0, 1))
+            with self.cond:
+                self.ready.append((slot, frame_index / self.fps))
+            frame_index += 1
+
+    def stop(self):
+        with self.cond:
+            self.running = False
+            self.cond.notify()
+        self.thread.join()
+        self.capture.release()
@@ -0,0 +1,200 @@
+"""
+Stall Watchdog
+==============
+
+This module defines the Watchdog class, which tracks heartbeats from
+the game's loops (Modbus poll, event monitor, render loop) and dumps
+the stacks of every thread when one of them misses its deadline.
+
+It also provides SamplingProfiler, a low-overhead sampler built on
+sys._current_frames() that writes folded stacks ("a;b;c 42" per line),
+the input format of flamegraph.pl and speedscope. The profiler can be
+started on demand with a signal on a running cabinet.
+
+Author: Wizard Pinball contributors
+Project: University of Idaho PLC Pinball
+Last Updated: 10/19/2026
+"""
+
+import os
+import signal
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from typing import Dict, List, Optional
+
+
+def _thread_names() -> Dict[int, str]:
+    return {thread.ident: thread.name for thread in threading.enumerate()}
+
+
+def format_all_stacks(skip: Optional[int] = None) -> str:
+    """Return the current stack of every thread as text."""
+    names = _thread_names()
+    lines = []
+    for ident, frame in sys._current_frames().items():
+        if ident == skip:
+            continue
+        lines.append(f"--- Thread {names.get(ident, '?')} ({ident}) ---")
+        lines.extend(line.rstrip("\n") for line in traceback.format_stack(frame))
+        lines.append("")
+    return "\n".join(lines)
+
+
+class Heartbeat:
+    """Liveness record for one loop. The loop calls beat() once per iteration."""
+    __slots__ = ("name", "deadline", "last_beat", "stalled")
+
+    def __init__(self, name: str, deadline: float):
+        self.name = name
+        self.deadline = deadline
+        self.last_beat = time.monotonic()
+        self.stalled = False
+
+    def beat(self):
+        self.last_beat = time.monotonic()
+
+
+class Watchdog:
+    """
+    Background thread that checks every registered heartbeat and captures
+    all thread stacks the first time a loop overruns its deadline.
+    :param dump_dir: Directory for stall reports; None only prints them.
+    :param check_interval: Seconds between heartbeat checks.
+    """
+    def __init__(self, dump_dir: Optional[str] = None, check_interval: float = 0.1):
+        self.dump_dir = dump_dir
+        self.check_interval = check_interval
+        self.heartbeats: List[Heartbeat] = []
+        self.profiler: Optional[SamplingProfiler] = None
+        self.stall_count = 0
+        if dump_dir:
+            os.makedirs(dump_dir, exist_ok=True)
+
+        self.running = True
+        self.thread = threading.Thread(target=self._watch_loop, name="watchdog", daemon=True)
+        self.thread.start()
+
+    def register(self, name: str, deadline: float) -> Heartbeat:
+        """
+        Track a loop that must beat at least every deadline seconds.
+        Returns the Heartbeat the loop should call beat() on.
+        """
+        heartbeat = Heartbeat(name, deadline)
+        self.heartbeats.append(heartbeat)
+        return heartbeat
+
+    def _watch_loop(self):
+        while self.running:
+            now = time.monotonic()
+            for heartbeat in list(self.heartbeats):
+                late = now - heartbeat.last_beat
+                if late > heartbeat.deadline:
+                    if not heartbeat.stalled:
+                        heartbeat.stalled = True
+                        self._report(heartbeat, late)
+                elif heartbeat.stalled:
+                    heartbeat.stalled = False
+                    print(f"[Watchdog] {heartbeat.name} recovered")
+            time.sleep(self.check_interval)
+
+    def _report(self, heartbeat: Heartbeat, late: float):
+        stacks = format_all_stacks(skip=threading.get_ident())
+        header = (f"{heartbeat.name} missed its {heartbeat.deadline:.2f}s deadline "
+                  f"({late:.2f}s since last heartbeat)")
+        print(f"[Watchdog] STALL: {header}")
+        if not self.dump_dir:
+            print(stacks)
+            return
+        self.stall_count += 1
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        path = os.path.join(self.dump_dir, f"stall-{stamp}-{self.stall_count}-{heartbeat.name}.txt")
+        try:
+            with open(path, "w") as f:
+                f.write(header + "\n\n" + stacks)
+            print(f"[Watchdog] Stacks written to {path}")
+        except OSError as e:
+            print(f"[Watchdog] Failed to write {path}: {e}")
+            print(stacks)
+
+    def toggle_profiler(self, *_args):
+        """
+        Start the sampling profiler, or stop it and write the folded stacks
+        to dump_dir. Usable directly as a signal handler.
+        """
+        if self.profiler is None:
+            self.profiler = SamplingProfiler()
+            self.profiler.start()
+            print("[Watchdog] Sampling profiler started")
+            return
+        profiler, self.profiler = self.profiler, None
+        profiler.stop()
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        path = os.path.join(self.dump_dir or ".", f"profile-{stamp}.folded")
+        profiler.write_folded(path)
+        print(f"[Watchdog] Profile with {profiler.num_samples} samples written to {path}")
+
+    def install_signal_handler(self, signum: int = getattr(signal, "SIGUSR1", 0)):
+        """Toggle the profiler with a signal, e.g. `kill -USR1 <pid>`. Main thread only."""
+        if signum:
+            signal.signal(signum, self.toggle_profiler)
+
+    def stop(self):
+        self.running = False
+        self.thread.join()
+        if self.profiler is not None:
+            self.toggle_profiler()
+
+
+class SamplingProfiler:
+    """
+    Samples the stack of every thread at a fixed interval and counts
+    identical stacks. Overhead is one sys._current_frames() walk per sample.
+    :param interval: Seconds between samples.
+    """
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.num_samples = 0
+        self.running = False
+        self.thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self._sample_loop, name="sampling-profiler", daemon=True)
+        self.thread.start()
+
+    def _sample_loop(self):
+        own = threading.get_ident()
+        code_names: Dict[object, str] = {}
+        while self.running:
+            names = _thread_names()
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                parts = []
+                while frame is not None:
+                    code = frame.f_code
+                    label = code_names.get(code)
+                    if label is None:
+                        label = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+                        code_names[code] = label
+                    parts.append(label)
+                    frame = frame.f_back
+                parts.append(names.get(ident, str(ident)))
+                self.stacks[";".join(reversed(parts))] += 1
+            self.num_samples += 1
+            time.sleep(self.interval)
+
+    def stop(self):
+        self.running = False
+        if self.thread is not None:
+            self.thread.join()
+
+    def write_folded(self, path: str):
+        """Write one "frame;frame;frame count" line per distinct stack."""
+        with open(path, "w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
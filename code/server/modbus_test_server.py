@@ -4,7 +4,6 @@ import time
 import sys
 import termios
 import tty
-import os
 
 # Define key-to-register mappings (input registers)
 INPUT_REGISTER_KEYS = {
@@ -53,23 +52,6 @@ def listen_for_keys(server: ModbusServer):
 
         time.sleep(0.05)
 
-def clear_screen():
-    os.system('cls' if os.name == 'nt' else 'clear')
-
-# Thread to print all register and coil states
-def print_state(server: ModbusServer):
-    while True:
-        clear_screen()
-        coils = server.data_bank.get_coils(0, 8)
-        coil_status = " | ".join([f"C{i}:{'ON' if s else 'OFF'}" for i, s in enumerate(coils)])
-        inputs = server.data_bank.get_input_registers(0, 8)
-        input_status = " | ".join([f"IR{i}:{v}" for i, v in enumerate(inputs)])
-        print("📟 Modbus Coil States:")
-        print(coil_status)
-        print("\n📊 Input Register Counts:")
-        print(input_status)
-        time.sleep(1)
-
 # Main entry point
 if __name__ == "__main__":
     server = ModbusServer(host="0.0.0.0", port=502, no_block=True)
@@ -81,7 +63,7 @@ if __name__ == "__main__":
         server.data_bank.set_input_registers(0, [0] * 8)
 
         threading.Thread(target=listen_for_keys, args=(server,), daemon=True).start()
-        threading.Thread(target=print_state, args=(server,), daemon=True).start()
+        print("Run `python server/monitor.py --host localhost` to watch the values.")
 
         while True:
             time.sleep(10)
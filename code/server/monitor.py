@@ -0,0 +1,166 @@
+"""
+PLC Monitor
+===========
+
+Live terminal view of every device in config/devices.json for the
+service bench: current value, hit rate per minute and the round trip
+of the last Modbus request for each device.
+
+Only cells whose text changed are redrawn, using ANSI cursor
+positioning, so a refresh costs a few bytes of output. The monitor
+lowers its own CPU priority so it can run next to the game.
+
+Usage (from the code/ directory):
+    python server/monitor.py --host 192.168.1.10
+    python server/monitor.py --host localhost --port 502 --refresh 2
+
+Author: Wizard Pinball contributors
+Project: University of Idaho PLC Pinball
+Last Updated: 10/19/2026
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.modbus_api import ModbusAPI
+from core.event_api import EventAPI, COUNT, RISING
+
+DEFAULT_CONFIG = os.path.join(os.path.dirname(__file__), "..", "config", "devices.json")
+
+# hit rates are averaged over this many seconds
+RATE_WINDOW = 60.0
+
+COLUMNS = [("Device", 28), ("Type", 18), ("Dir", 8), ("Value", 8),
+           ("Hits/min", 10), ("RTT ms", 8), ("", 6)]
+HEADER_ROWS = 4
+
+
+class HitCounter:
+    """Timestamps of recent hits per device, fed from EventAPI subscriptions."""
+    def __init__(self):
+        self.hits: Dict[str, deque] = {}
+
+    def record(self, event):
+        count = event.delta if event.kind == COUNT else 1
+        self.hits.setdefault(event.device, deque()).append((event.timestamp, count))
+
+    def per_minute(self, device: str, now: float) -> float:
+        hits = self.hits.get(device)
+        if not hits:
+            return 0.0
+        while hits and hits[0][0] < now - RATE_WINDOW:
+            hits.popleft()
+        # list() copies atomically while the event thread appends
+        return sum(count for _, count in list(hits)) * 60.0 / RATE_WINDOW
+
+
+class Screen:
+    """Keeps the text of every cell and only rewrites the ones that change."""
+    def __init__(self, stream):
+        self.stream = stream
+        self.cells: Dict[Tuple[int, int], str] = {}
+        self.out: List[str] = []
+
+    def put(self, row: int, col: int, text: str, width: int):
+        text = text[:width].ljust(width)
+        if self.cells.get((row, col)) != text:
+            self.cells[(row, col)] = text
+            self.out.append(f"\x1b[{row};{col}H{text}")
+
+    def flush(self):
+        if self.out:
+            self.stream.write("".join(self.out))
+            self.stream.flush()
+            self.out.clear()
+
+
+def draw(screen: Screen, api: ModbusAPI, hits: HitCounter, names: List[str]):
+    now = time.time()
+    snapshot = api.read_snapshot()
+    sweep_ms, rtt_ms = api.read_timings()
+
+    status = "ONLINE" if snapshot.online else "OFFLINE"
+    screen.put(1, 1, f"Wizard PLC monitor  {api.host}:{api.port}  {status}  "
+                     f"sweep {sweep_ms:6.1f} ms  {time.strftime('%H:%M:%S')}", 100)
+
+    for i, name in enumerate(names):
+        device = api.devices[name]
+        row = HEADER_ROWS + i
+        col = 1
+        value = snapshot.values.get(name)
+        cells = [
+            name,
+            device.reg_type,
+            device.direction,
+            "-" if value is None else str(value),
+            f"{hits.per_minute(name, now):.1f}" if device.direction == "input" else "",
+            f"{rtt_ms[name]:.1f}" if name in rtt_ms else "-",
+            "STALE" if name in snapshot.stale else "",
+        ]
+        for text, (_, width) in zip(cells, COLUMNS):
+            screen.put(row, col, text, width)
+            col += width
+    screen.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Live view of the pinball PLC devices.")
+    parser.add_argument("--host", default="192.168.1.10")
+    parser.add_argument("--port", type=int, default=502)
+    parser.add_argument("--config", default=DEFAULT_CONFIG)
+    parser.add_argument("--refresh", type=float, default=4.0, help="screen refreshes per second")
+    parser.add_argument("--poll", type=float, default=0.1, help="seconds between Modbus sweeps")
+    args = parser.parse_args()
+
+    # stay out of the game's way when sharing the cabinet PC
+    if hasattr(os, "nice"):
+        os.nice(10)
+
+    # connection messages printed by ModbusAPI would scroll the layout
+    real_stdout = sys.stdout
+    sys.stdout = open(os.devnull, "w")
+
+    # the game is the only consumer of the PLC's event FIFO; acknowledging its
+    # records here would free slots the game has not read yet
+    api = ModbusAPI(args.host, args.port, args.config, poll_interval=args.poll, use_event_fifo=False)
+    events = EventAPI(api)
+    hits = HitCounter()
+    for name, device in api.devices.items():
+        if device.is_counter:
+            events.subscribe(name, COUNT, hits.record)
+        elif device.direction == "input":
+            events.subscribe(name, RISING, hits.record)
+    names = list(api.devices)
+
+    screen = Screen(real_stdout)
+    # clear once, hide the cursor, draw the static header
+    real_stdout.write("\x1b[2J\x1b[?25l")
+    col = 1
+    for title, width in COLUMNS:
+        screen.put(HEADER_ROWS - 1, col, title, width)
+        col += width
+
+    try:
+        interval = 1.0 / max(args.refresh, 0.1)
+        while True:
+            draw(screen, api, hits, names)
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        real_stdout.write(f"\x1b[{HEADER_ROWS + len(names) + 1};1H\x1b[?25h\n")
+        real_stdout.flush()
+        events.stop()
+        api.stop()
+        sys.stdout.close()
+        sys.stdout = real_stdout
+
+
+if __name__ == "__main__":
+    main()
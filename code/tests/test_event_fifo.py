@@ -0,0 +1,134 @@
+"""
+Event FIFO Test
+===============
+
+Reads the SimulatedPLC's event ring through EventFifo: records across
+the wraparound of the ring, a ring overflow and the full sweep
+ModbusAPI runs after it, and a lost acknowledge that is retried without
+delivering records twice. The PLC clock is stepped by hand.
+
+Run from the code/ directory:
+    python -m pytest -q
+
+Author: Wizard Pinball contributors
+Project: University of Idaho PLC Pinball
+Last Updated: 10/19/2026
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.event_fifo import EventFifo, TAIL, HEAD, source_code
+from core.modbus_api import ModbusAPI
+from core.plc_connection import PLCConnection
+from core.sim_plc import SimulatedPLC, COUNTER_REGISTERS
+
+CONFIG_PATH = os.path.join(os.path.dirname(__file__), "..", "config", "devices.json")
+FIFO_ADDRESS = 101
+SLINGSHOT = source_code("input_register", COUNTER_REGISTERS["slingshot"] + 1)
+
+
+class ManualClock:
+    """PLC clock that only moves when the test says so."""
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class Bench:
+    """An EventFifo reading a simulated PLC with a running game."""
+    def __init__(self, capacity: int):
+        self.clock = ManualClock()
+        self.plc = SimulatedPLC(fifo_address=FIFO_ADDRESS, fifo_capacity=capacity, clock=self.clock)
+        self.connection = PLCConnection("sim", 0, transport=self.plc)
+        self.connection.maintain()
+        self.fifo = EventFifo(FIFO_ADDRESS, capacity)
+        self.read_time = 1000.0
+        self.plc.press_start()
+        # the FIFO goes live once it has seen the clock move; the start backlog is skipped
+        self.read()
+        self.read()
+        assert self.fifo.live
+
+    def read(self):
+        self.clock.now += 0.01
+        self.read_time += 0.01
+        return self.fifo.read(self.connection, self.read_time)
+
+    def register(self, offset: int) -> int:
+        return self.plc.holding_registers[FIFO_ADDRESS - 1 + offset]
+
+
+def test_wraparound():
+    bench = Bench(capacity=4)
+    values = []
+    for _ in range(6):
+        bench.plc.hit("slingshot", 2)
+        records = bench.read()
+        assert [source for source, _, _ in records] == [SLINGSHOT, SLINGSHOT]
+        values.extend(value for _, value, _ in records)
+        assert bench.register(TAIL) == bench.register(HEAD)
+    # 12 records through a ring of 4 slots, in order and none twice
+    assert values == list(range(1, 13))
+
+
+def test_overflow():
+    bench = Bench(capacity=4)
+    bench.plc.hit("slingshot", 5)
+    records = bench.read()
+    # the ring holds capacity - 1 records; the PLC counts the rest as dropped
+    assert [value for _, value, _ in records] == [1, 2, 3]
+    assert bench.fifo.overflowed
+    bench.plc.hit("slingshot")
+    assert [value for _, value, _ in bench.read()] == [6]
+    assert not bench.fifo.overflowed
+
+
+def test_overflow_forces_full_sweep(tmp_path):
+    with open(CONFIG_PATH) as f:
+        config = json.load(f)
+    config["event_fifo"] = {"enabled": True, "address": FIFO_ADDRESS, "capacity": 4}
+    config_path = tmp_path / "devices.json"
+    config_path.write_text(json.dumps(config))
+
+    clock = ManualClock()
+    plc = SimulatedPLC(fifo_address=FIFO_ADDRESS, fifo_capacity=4, clock=clock)
+    api = ModbusAPI("sim", 0, str(config_path), transport=plc, start_thread=False)
+    try:
+        plc.press_start()
+        for _ in range(3):
+            clock.now += 0.01
+            api.poll_once()
+        assert api.fifo.live
+
+        plc.hit("slingshot", 5)
+        clock.now += 0.01
+        api.poll_once()
+        snapshot, records = api.read_updates()
+        assert [value for name, value, _ in records if name == "slingshot"] == [1, 2, 3]
+        # the sweep after the overflow reads the counter itself
+        assert snapshot.values["slingshot"] == 5
+    finally:
+        api.stop()
+
+
+def test_acknowledge_retry():
+    bench = Bench(capacity=8)
+    write = bench.plc.write_single_register
+    bench.plc.write_single_register = lambda address, value: None
+
+    bench.plc.hit("slingshot", 2)
+    assert [value for _, value, _ in bench.read()] == [1, 2]
+    # the acknowledge was lost: the PLC's tail is still behind
+    assert bench.register(TAIL) != bench.register(HEAD)
+
+    bench.plc.write_single_register = write
+    assert bench.read() == []
+    assert bench.register(TAIL) == bench.register(HEAD)
+    bench.plc.hit("slingshot")
+    assert [value for _, value, _ in bench.read()] == [3]
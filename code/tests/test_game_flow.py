@@ -0,0 +1,221 @@
+"""
+Game Flow Test
+==============
+
+Drives ModbusAPI, EventAPI and GameStateController through a whole game
+on the SimulatedPLC: start, scoring hits, three ball drains, the game
+over timeout and back to attract. Threads are not started; every step
+polls, checks for events and updates the controller explicitly.
+
+Run from the code/ directory:
+    python -m pytest -q
+
+Author: Wizard Pinball contributors
+Project: University of Idaho PLC Pinball
+Last Updated: 10/19/2026
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pygame
+
+from core.event_api import EventAPI
+from core.game_state import GameStateController, GAME_OVER_TIMEOUT_MS
+from core.modbus_api import ModbusAPI
+from core.sim_plc import SimulatedPLC
+
+CONFIG_PATH = os.path.join(os.path.dirname(__file__), "..", "config", "devices.json")
+FRAME_MS = 16
+
+
+class RecordingSound:
+    """Stands in for SoundAPI; records what the controller asked to play."""
+    def __init__(self):
+        self.played = []
+        self.music = []
+
+    def play(self, name):
+        self.played.append(name)
+
+    def set_background_music(self, filename, volume=1.0):
+        self.music.append(filename)
+
+
+class ManualClock:
+    """PLC clock that only moves when the test steps the cabinet."""
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class Cabinet:
+    """The game's I/O stack on a simulated PLC, stepped by hand."""
+    def __init__(self, plc: SimulatedPLC, config_path: str = CONFIG_PATH):
+        self.plc = plc
+        self.clock = plc.clock
+        self.modbus_api = ModbusAPI("sim", 0, config_path, transport=plc, start_thread=False)
+        self.event_api = EventAPI(self.modbus_api, start_thread=False)
+        self.sound_api = RecordingSound()
+        self.controller = GameStateController(
+            screen_api=None,
+            event_api=self.event_api,
+            modbus_api=self.modbus_api,
+            sound_api=self.sound_api,
+        )
+        for name in self.modbus_api.devices:
+            for suffix in ("pressed", "released"):
+                event_name = f"{name}_{suffix}"
+                self.event_api.register(event_name, lambda e=event_name: self.controller.handle_event(e))
+
+    def step(self, delta_ms: int = FRAME_MS):
+        # the FIFO is live only while the PLC's millisecond clock moves
+        self.clock.now += delta_ms / 1000
+        self.modbus_api.poll_once()
+        self.event_api.check_once()
+        self.controller.update(delta_ms)
+
+    def stop(self):
+        self.event_api.stop()
+        self.modbus_api.stop()
+
+
+@pytest.fixture(autouse=True)
+def mixer():
+    pygame.mixer.init()
+    yield
+    pygame.mixer.quit()
+
+
+@pytest.fixture
+def fifo_config(tmp_path):
+    """devices.json with the event FIFO enabled; the shipped config has it off."""
+    with open(CONFIG_PATH) as f:
+        config = json.load(f)
+    config["event_fifo"]["enabled"] = True
+    path = tmp_path / "devices.json"
+    path.write_text(json.dumps(config))
+    return str(path)
+
+
+@pytest.mark.parametrize("fifo_address", [101, None], ids=["event_fifo", "polling"])
+def test_full_game(fifo_address, fifo_config):
+    plc = SimulatedPLC(fifo_address=fifo_address, clock=ManualClock())
+    # with fifo_address None the config still enables the FIFO, so this also covers the fallback
+    cabinet = Cabinet(plc, fifo_config)
+    controller = cabinet.controller
+    try:
+        for _ in range(3):
+            cabinet.step()
+        assert controller.get_state() == "attract"
+        assert cabinet.modbus_api.fifo.live == (fifo_address is not None)
+
+        plc.press_start()
+        cabinet.step()
+        assert controller.get_state() == "play"
+        assert controller.current_ball == 1
+
+        plc.hit("slingshot", 3)
+        plc.hit("pop_bumper", 2)
+        cabinet.step()
+        assert controller.score == 50
+        assert controller.device_hits == {"slingshot": 3, "pop_bumper": 2}
+        assert "chaching" in cabinet.sound_api.played
+
+        plc.hit("ball_drain")
+        cabinet.step()
+        assert controller.get_state() == "play"
+        assert controller.current_ball == 2
+
+        plc.hit("ball_drain")
+        cabinet.step()
+        assert controller.current_ball == 3
+
+        plc.hit("ball_drain")
+        cabinet.step()
+        assert controller.get_state() == "game_over"
+        assert controller.score == 50
+        # the PLC sees game_over_bit on its next scan and drops game_on
+        cabinet.step()
+        assert not plc.game_running
+        assert controller.get_state() == "game_over"
+
+        for _ in range(GAME_OVER_TIMEOUT_MS // 1000 - 1):
+            cabinet.step(1000)
+        assert controller.get_state() == "game_over"
+        cabinet.step(1000)
+        cabinet.step(1000)
+        assert controller.get_state() == "attract"
+        assert controller.get_previous_state() == "game_over"
+        assert controller.score == 0
+    finally:
+        cabinet.stop()
+
+
+def test_restart_from_game_over():
+    plc = SimulatedPLC(clock=ManualClock())
+    cabinet = Cabinet(plc)
+    controller = cabinet.controller
+    try:
+        cabinet.step()
+        plc.press_start()
+        cabinet.step()
+        plc.hit("slingshot")
+        plc.hit("ball_drain", 3)
+        cabinet.step()
+        cabinet.step()
+        assert controller.get_state() == "game_over"
+        loaded = plc.balls_loaded
+
+        # start again before the game over timeout sends the cabinet to attract
+        plc.press_start()
+        cabinet.step()
+        assert controller.get_state() == "play"
+        assert controller.current_ball == 1
+        assert controller.score == 0
+        cabinet.step()
+        assert plc.balls_loaded == loaded + 1
+        assert cabinet.sound_api.music.count("pinball_wizard.wav") == 2
+    finally:
+        cabinet.stop()
+
+
+def test_extra_ball_counts_down_without_a_drain():
+    plc = SimulatedPLC(clock=ManualClock())
+    cabinet = Cabinet(plc)
+    controller = cabinet.controller
+    try:
+        cabinet.step()
+        plc.press_start()
+        cabinet.step()
+        for _ in range(2):
+            plc.hit("ball_drain")
+            cabinet.step()
+        assert controller.current_ball == 3
+
+        # the extra_ball rising edge takes one off the ball_drain up/down counter
+        cabinet.modbus_api.write_value("extra_ball", True)
+        cabinet.step()
+        cabinet.step()
+        cabinet.modbus_api.write_value("extra_ball", False)
+        cabinet.step()
+        assert cabinet.modbus_api.read_value("ball_drain") == 1
+        assert controller.current_ball == 3
+        assert controller.get_state() == "play"
+
+        plc.hit("ball_drain")
+        cabinet.step()
+        assert controller.current_ball == 4
+        plc.hit("ball_drain")
+        cabinet.step()
+        assert controller.get_state() == "game_over"
+    finally:
+        cabinet.stop()
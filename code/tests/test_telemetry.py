@@ -0,0 +1,91 @@
+"""
+Telemetry File Test
+===================
+
+Writes a game's worth of telemetry to a .wzt file and reads it back,
+then cuts the file short at every byte after the header, as a power
+loss mid-write would, and checks read_telemetry() keeps exactly the
+chunks that were written completely.
+
+Run from the code/ directory:
+    python -m pytest -q
+
+Author: Wizard Pinball contributors
+Project: University of Idaho PLC Pinball
+Last Updated: 10/19/2026
+"""
+
+import os
+import struct
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.event_api import COUNT, RISING, DeviceEvent
+from core.telemetry import Telemetry, read_telemetry, _read_chunk
+
+DEVICES = ["slingshot", "pop_bumper", "start_button"]
+STATES = ["attract", "play", "game_over"]
+
+
+def write_game(out_dir: str) -> str:
+    telemetry = Telemetry(out_dir, DEVICES, STATES)
+    telemetry.start_game()
+    telemetry.record_transition(0, 1)
+    telemetry.record_hit(DeviceEvent("slingshot", COUNT, 0, 3, 3, 1000.0))
+    telemetry.record_hit(DeviceEvent("pop_bumper", COUNT, 0, 1, 1, 1001.0))
+    telemetry.record_hit(DeviceEvent("start_button", RISING, 0, 1, 1, 1002.0))
+    telemetry.record_ball(1, 12000)
+    telemetry.record_transition(1, 2)
+    telemetry.end_game(50)
+    telemetry.stop()
+    (path,) = [os.path.join(out_dir, name) for name in os.listdir(out_dir) if name.startswith("game-")]
+    return path
+
+
+def chunk_ends(path: str):
+    """(header size, [(offset after chunk, table, rows)]) of a complete file."""
+    with open(path, "rb") as f:
+        f.read(4)
+        _, meta_len = struct.unpack("<HI", f.read(6))
+        f.read(meta_len)
+        header_size = f.tell()
+        ends = []
+        while True:
+            chunk = _read_chunk(f)
+            if chunk is None:
+                return header_size, ends
+            name, columns = chunk
+            ends.append((f.tell(), name, len(columns[0][1])))
+
+
+def test_round_trip(tmp_path):
+    meta, tables = read_telemetry(write_game(str(tmp_path)))
+    assert meta == {"devices": DEVICES, "states": STATES}
+    assert list(tables["hits"]["device"]) == [0, 1, 2]
+    assert list(tables["hits"]["count"]) == [3, 1, 1]
+    assert list(tables["hits"]["t"]) == [1000.0, 1001.0, 1002.0]
+    assert list(tables["transitions"]["from"]) == [0, 1]
+    assert list(tables["transitions"]["to"]) == [1, 2]
+    assert list(tables["balls"]["duration_ms"]) == [12000]
+    assert list(tables["games"]["score"]) == [50]
+
+
+def test_truncated_chunks(tmp_path):
+    path = write_game(str(tmp_path))
+    header_size, ends = chunk_ends(path)
+    with open(path, "rb") as f:
+        data = f.read()
+    cut_path = str(tmp_path / "cut.wzt")
+    for cut in range(header_size, len(data) + 1):
+        with open(cut_path, "wb") as f:
+            f.write(data[:cut])
+        _, tables = read_telemetry(cut_path)
+
+        expected = {}
+        for end, name, rows in ends:
+            if end <= cut:
+                expected[name] = expected.get(name, 0) + rows
+        assert {name: len(table["t"]) for name, table in tables.items()} == expected, cut
+        for table in tables.values():
+            assert len({len(column) for column in table.values()}) == 1, cut
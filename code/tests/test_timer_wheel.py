@@ -0,0 +1,105 @@
+"""
+Timer Wheel Test
+================
+
+Checks TimerWheel expiry times: rounding up to the tick, delays longer
+than one turn of the wheel, cancellation, timers scheduled from a
+callback, and firing order within a slot.
+
+Run from the code/ directory:
+    python -m pytest -q
+
+Author: Wizard Pinball contributors
+Project: University of Idaho PLC Pinball
+Last Updated: 10/19/2026
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.timer_wheel import TimerWheel
+
+TICK_MS = 50
+NUM_SLOTS = 8  # one turn of the wheel is 400 ms
+
+
+def fire_time(wheel: TimerWheel, delay_ms: int, step_ms: int = TICK_MS, limit_ms: int = 10000):
+    """Schedule one timer and return the advanced time at which it fired."""
+    fired = []
+    wheel.schedule(delay_ms, lambda: fired.append(True))
+    now = 0
+    while not fired and now < limit_ms:
+        wheel.advance(step_ms)
+        now += step_ms
+    return now if fired else None
+
+
+def test_rounds_up_to_tick():
+    assert fire_time(TimerWheel(TICK_MS, NUM_SLOTS), 0) == 50
+    assert fire_time(TimerWheel(TICK_MS, NUM_SLOTS), 50) == 50
+    assert fire_time(TimerWheel(TICK_MS, NUM_SLOTS), 51) == 100
+
+
+def test_multi_round_delays():
+    for delay_ms in (400, 401, 450, 800, 1000, 2950):
+        expected = -(-delay_ms // TICK_MS) * TICK_MS
+        assert fire_time(TimerWheel(TICK_MS, NUM_SLOTS), delay_ms) == expected, delay_ms
+
+
+def test_multi_round_after_cursor_moved():
+    wheel = TimerWheel(TICK_MS, NUM_SLOTS)
+    wheel.advance(3 * TICK_MS + 20)
+    # the 20 ms already elapsed count toward the first tick
+    assert fire_time(wheel, 1000, step_ms=10) == 980
+
+
+def test_large_advance_fires_everything_due():
+    wheel = TimerWheel(TICK_MS, NUM_SLOTS)
+    fired = []
+    for delay_ms in (100, 500, 1200):
+        wheel.schedule(delay_ms, lambda d=delay_ms: fired.append(d))
+    wheel.advance(1199)
+    assert fired == [100, 500]
+    wheel.advance(1)
+    assert fired == [100, 500, 1200]
+
+
+def test_cancel():
+    wheel = TimerWheel(TICK_MS, NUM_SLOTS)
+    fired = []
+    timer = wheel.schedule(900, lambda: fired.append("cancelled"))
+    wheel.schedule(900, lambda: fired.append("kept"))
+    wheel.advance(500)
+    timer.cancel()
+    wheel.advance(500)
+    assert fired == ["kept"]
+
+
+def test_order_and_rescheduling():
+    wheel = TimerWheel(TICK_MS, NUM_SLOTS)
+    fired = []
+
+    def repeat():
+        fired.append("repeat")
+        if fired.count("repeat") < 3:
+            wheel.schedule(400, repeat)
+
+    wheel.schedule(100, lambda: fired.append("a"))
+    wheel.schedule(100, lambda: fired.append("b"))
+    wheel.schedule(400, repeat)
+    wheel.advance(100)
+    assert fired == ["a", "b"]
+    wheel.advance(1200)
+    assert fired == ["a", "b", "repeat", "repeat", "repeat"]
+
+
+def test_clear():
+    wheel = TimerWheel(TICK_MS, NUM_SLOTS)
+    fired = []
+    wheel.schedule(100, lambda: fired.append(True))
+    wheel.schedule(1000, lambda: fired.append(True))
+    wheel.clear()
+    wheel.advance(2000)
+    assert fired == []